@@ -1,17 +1,14 @@
 """Slay AI Agent using Claude Code SDK."""
 
 import asyncio
+import functools
+import json
 import os
 import sys
+import traceback
 from pathlib import Path
 from dataclasses import dataclass, field
-from typing import Callable
-
-# Set OAuth token before importing SDK
-os.environ['CLAUDE_CODE_OAUTH_TOKEN'] = 'sk-ant-REDACTED'
-os.environ.pop('ANTHROPIC_API_KEY', None)  # Ensure no API key
-
-from claude_code_sdk import query, ClaudeCodeOptions, AssistantMessage, TextBlock, ToolUseBlock, ResultMessage
+from typing import Awaitable, Callable
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
@@ -19,6 +16,84 @@ from ai.tools import SYSTEM_PROMPT
 from game.state import GameState
 
 
+@functools.cache
+def _load_sdk():
+    """Import the Claude Code SDK once, on first use.
+
+    Auth comes from CLAUDE_CODE_OAUTH_TOKEN in the environment. An API key
+    would take precedence over it, so it is removed first.
+    """
+    os.environ.pop('ANTHROPIC_API_KEY', None)
+    import claude_code_sdk
+    return claude_code_sdk
+
+
+# Tool calls are decoded where they start; the text around them is reasoning
+_decode_json = json.JSONDecoder().raw_decode
+
+
+def _may_continue(buf: str, error: json.JSONDecodeError) -> bool:
+    """Whether JSON that failed to decode may still be completed by more text.
+
+    True when decoding ran off the end of the buffer (within a partial literal
+    such as "tru" or "-") or stopped in a string that is not closed yet.
+    """
+    return len(buf) - error.pos <= 5 or error.msg.startswith("Unterminated string")
+
+
+class ToolCallScanner:
+    """Incremental scanner for JSON tool calls in streamed text.
+
+    Text is fed block by block. Each "{" is tried as the start of a JSON
+    object; objects with a "tool" key are emitted as soon as they are
+    complete, and everything else (including braces that do not start valid
+    JSON) is emitted as reasoning. Calls may be nested, pretty-printed over
+    several lines and split across blocks: an object that is still
+    incomplete at the end of a block is held until more text arrives.
+    """
+
+    def __init__(self):
+        self._buffer = ""  # Text from a possibly incomplete object onwards
+
+    def feed(self, text: str) -> list[tuple[str, str]]:
+        """Scan new text, returning ("text", reasoning) / ("tool", json) segments in order."""
+        # Reasoning-only block with nothing held: no call can start here
+        if not self._buffer and "{" not in text:
+            return [("text", text)] if text else []
+        return self._scan(self._buffer + text, final=False)
+
+    def flush(self) -> list[tuple[str, str]]:
+        """Scan what is left at end of stream; incomplete objects become reasoning."""
+        buf, self._buffer = self._buffer, ""
+        return self._scan(buf, final=True)
+
+    def _scan(self, buf: str, final: bool) -> list[tuple[str, str]]:
+        segments = []
+        text_start = 0
+        held = len(buf)
+        i = buf.find("{")
+        while i >= 0:
+            try:
+                obj, end = _decode_json(buf, i)
+            except json.JSONDecodeError as e:
+                if not final and _may_continue(buf, e):
+                    held = i
+                    break
+                i = buf.find("{", i + 1)  # A brace in the prose
+                continue
+            if isinstance(obj, dict) and "tool" in obj:
+                if i > text_start:
+                    segments.append(("text", buf[text_start:i]))
+                segments.append(("tool", buf[i:end]))
+                text_start = end
+            i = buf.find("{", end)
+
+        if held > text_start:
+            segments.append(("text", buf[text_start:held]))
+        self._buffer = buf[held:]
+        return segments
+
+
 @dataclass
 class AgentMessage:
     """Message from agent to broadcast."""
@@ -31,11 +106,30 @@ class AgentMessage:
 class SlayAgent:
     """AI agent that plays Slay using Claude Code SDK."""
 
-    def __init__(self, player_id: int, color_name: str, model: str = "claude-sonnet-4-20250514"):
+    def __init__(self, player_id: int, color_name: str, model: str = "claude-sonnet-4-20250514",
+                 pacing_ms: int = 0):
         self.player_id = player_id
         self.color_name = color_name
         self.model = model
+        self.pacing_ms = pacing_ms  # Server-side delay between messages, 0 = none
         self.session_id: str | None = None  # For conversation continuity
+        self._dispatch = {
+            'move': self._do_move,
+            'buy': self._do_buy,
+            'end_turn': self._do_end_turn,
+        }
+
+        # Custom system prompt for Slay (constant for this player, built once)
+        self._system_prompt = f"""{SYSTEM_PROMPT}
+
+You are {self.color_name} (Player {self.player_id}).
+
+To take actions, output JSON on its own line:
+{{"tool": "move", "from_q": 0, "from_r": 6, "to_q": 0, "to_r": 5}}
+{{"tool": "buy", "unit_type": "peasant", "q": 0, "r": 6}}
+{{"tool": "end_turn"}}
+
+Coordinates must match exactly what's shown in "Available moves" and "YOUR EMPTY HEXES"."""
 
     async def play_turn(
         self,
@@ -43,163 +137,172 @@ class SlayAgent:
         on_message: Callable[[AgentMessage], None] | None = None
     ) -> list[dict]:
         """Play a full turn using Claude Code SDK."""
-        import inspect
         actions = []
 
         async def emit(msg: AgentMessage):
             if on_message:
                 result = on_message(msg)
-                if inspect.iscoroutine(result):
+                if asyncio.iscoroutine(result):
                     await result
 
         # Build the prompt with current game state
         state_prompt = game_state.to_prompt()
 
-        # Custom system prompt for Slay
-        system_prompt = f"""{SYSTEM_PROMPT}
-
-You are {self.color_name} (Player {self.player_id}).
-
-To take actions, output JSON on its own line:
-{{"tool": "move", "from_q": 0, "from_r": 6, "to_q": 0, "to_r": 5}}
-{{"tool": "buy", "unit_type": "peasant", "q": 0, "r": 6}}
-{{"tool": "end_turn"}}
-
-Coordinates must match exactly what's shown in "Available moves" and "YOUR EMPTY HEXES"."""
-
         user_prompt = f"""{state_prompt}
 
 Analyze the situation, decide your strategy, and take your actions."""
 
         # Configure SDK options
-        options = ClaudeCodeOptions(
+        sdk = _load_sdk()
+        options = sdk.ClaudeCodeOptions(
             model=self.model,
-            system_prompt=system_prompt,
+            system_prompt=self._system_prompt,
             max_turns=50,
             resume=self.session_id,  # Continue previous conversation
         )
 
-        turn_ended = False
         full_response = ""
-
+        scanner = ToolCallScanner()
+        # Tool calls run as tasks; the lock keeps game mutations serial and in order
+        pending: list[asyncio.Task] = []
+        state_lock = asyncio.Lock()
+
+        async def handle_segments(segments: list[tuple[str, str]]):
+            for kind, segment in segments:
+                if kind == "text":
+                    await self._emit_thinking(emit, segment)
+                    continue
+
+                # Send tool call, execute it without stalling the stream
+                await emit(AgentMessage(
+                    type="tool_call",
+                    content=segment,
+                    player_id=self.player_id
+                ))
+                pending.append(asyncio.create_task(
+                    self._handle_tool(segment, game_state, emit, state_lock, actions)
+                ))
+
+        cancelled = False
         try:
-            async for message in query(prompt=user_prompt, options=options):
-                if isinstance(message, AssistantMessage):
+            async for message in sdk.query(prompt=user_prompt, options=options):
+                if isinstance(message, sdk.AssistantMessage):
                     for block in message.content:
-                        if isinstance(block, TextBlock):
-                            text = block.text.strip()
-                            if text:
-                                full_response += text + "\n"
-
-                                # Parse JSON tool calls from text
-                                import json
-                                import re
-                                json_pattern = r'\{[^{}]*"tool"[^{}]*\}'
-
-                                # Split text into parts (reasoning vs tool calls)
-                                last_end = 0
-                                for match in re.finditer(json_pattern, text):
-                                    # Send reasoning before this tool call (split by paragraphs)
-                                    reasoning = text[last_end:match.start()].strip()
-                                    if reasoning:
-                                        # Split into paragraphs for progressive display
-                                        paragraphs = [p.strip() for p in reasoning.split('\n\n') if p.strip()]
-                                        for para in paragraphs:
-                                            await emit(AgentMessage(
-                                                type="thinking",
-                                                content=para,
-                                                player_id=self.player_id
-                                            ))
-                                            await asyncio.sleep(0.4)  # Delay between paragraphs
-
-                                    # Send tool call
-                                    tool_json = match.group()
-                                    await emit(AgentMessage(
-                                        type="tool_call",
-                                        content=tool_json,
-                                        player_id=self.player_id
-                                    ))
-                                    await asyncio.sleep(0.5)  # Delay for visibility
-
-                                    # Execute tool
-                                    try:
-                                        tool_call = json.loads(tool_json)
-                                        action = self._execute_tool(tool_call, game_state)
-                                        if action:
-                                            actions.append(action)
-                                            await emit(AgentMessage(
-                                                type="tool_result",
-                                                content=f"{action.get('success', True) and '✓' or '✗'} {action.get('message', '')}",
-                                                player_id=self.player_id,
-                                                data=action
-                                            ))
-                                            await asyncio.sleep(0.3)  # Delay for visibility
-                                            if action.get('type') == 'end_turn':
-                                                turn_ended = True
-                                    except json.JSONDecodeError:
-                                        pass
-
-                                    last_end = match.end()
-
-                                # Send remaining reasoning after last tool call
-                                remaining = text[last_end:].strip()
-                                if remaining:
-                                    paragraphs = [p.strip() for p in remaining.split('\n\n') if p.strip()]
-                                    for para in paragraphs:
-                                        await emit(AgentMessage(
-                                            type="thinking",
-                                            content=para,
-                                            player_id=self.player_id
-                                        ))
-                                        await asyncio.sleep(0.3)
-
-                elif isinstance(message, ResultMessage):
+                        if isinstance(block, sdk.TextBlock) and block.text.strip():
+                            full_response += block.text
+
+                            # Split streamed text into reasoning and tool calls
+                            await handle_segments(scanner.feed(block.text))
+
+                elif isinstance(message, sdk.ResultMessage):
                     # Store session_id for conversation continuity
                     self.session_id = message.session_id
 
+            # Objects still incomplete at end of stream are plain reasoning
+            await handle_segments(scanner.flush())
+
+        except asyncio.CancelledError:
+            cancelled = True
+            raise
         except Exception as e:
             print(f"Agent error: {e}")
-            import traceback
             traceback.print_exc()
+        finally:
+            # Tool calls already issued settle before the turn can end; a
+            # cancelled turn must not keep changing the game, so they stop too
+            if cancelled:
+                for task in pending:
+                    task.cancel()
+            results = await asyncio.gather(*pending, return_exceptions=True)
+            for error in results:
+                if isinstance(error, Exception):
+                    print(f"Agent tool error: {error}")
+                    traceback.print_exception(error)
 
         # Force end turn if not ended
+        turn_ended = any(a.get('type') == 'end_turn' for a in actions)
         if not turn_ended:
             result = game_state.end_turn()
-            actions.append({"type": "end_turn", "forced": True, **result})
+            action = {"type": "end_turn", "forced": True, **result}
+            actions.append(action)
+            # Reported like any tool result so the controller records it in history
             await emit(AgentMessage(
-                type="summary",
+                type="tool_result",
                 content="Turn ended (forced)",
-                player_id=self.player_id
+                player_id=self.player_id,
+                data=action
             ))
 
         return actions
 
+    async def _handle_tool(
+        self,
+        tool_json: str,
+        game_state: GameState,
+        emit: Callable[[AgentMessage], Awaitable[None]],
+        lock: asyncio.Lock,
+        actions: list[dict]
+    ):
+        """Execute a tool call and report its result."""
+        try:
+            tool_call = json.loads(tool_json)
+        except json.JSONDecodeError:
+            return
+
+        async with lock:
+            await self._pace()
+            action = self._execute_tool(tool_call, game_state)
+            if not action:
+                return
+            actions.append(action)
+            await emit(AgentMessage(
+                type="tool_result",
+                content=f"{action.get('success', True) and '✓' or '✗'} {action.get('message', '')}",
+                player_id=self.player_id,
+                data=action
+            ))
+            await self._pace()
+
+    async def _emit_thinking(self, emit: Callable[[AgentMessage], Awaitable[None]], reasoning: str):
+        """Emit a block of reasoning as one message, blank paragraphs removed."""
+        paragraphs = [p.strip() for p in reasoning.split('\n\n') if p.strip()]
+        if not paragraphs:
+            return
+        await emit(AgentMessage(
+            type="thinking",
+            content="\n\n".join(paragraphs),
+            player_id=self.player_id
+        ))
+        await self._pace()
+
+    async def _pace(self):
+        """Optional server-side pacing between messages (off by default)."""
+        if self.pacing_ms:
+            await asyncio.sleep(self.pacing_ms / 1000)
+
     def _execute_tool(self, tool_call: dict, game_state: GameState) -> dict | None:
         """Execute a tool call from agent output."""
-        tool = tool_call.get('tool')
-
-        if tool == 'move':
-            result = game_state.move_unit(
-                from_q=tool_call.get('from_q'),
-                from_r=tool_call.get('from_r'),
-                to_q=tool_call.get('to_q'),
-                to_r=tool_call.get('to_r')
-            )
-            return result
-
-        elif tool == 'buy':
-            result = game_state.buy_unit(
-                unit_type=tool_call.get('unit_type'),
-                target_q=tool_call.get('q'),
-                target_r=tool_call.get('r')
-            )
-            return result
+        handler = self._dispatch.get(tool_call.get('tool'))
+        return handler(tool_call, game_state) if handler else None
+
+    def _do_move(self, tool_call: dict, game_state: GameState) -> dict:
+        return game_state.move_unit(
+            from_q=tool_call.get('from_q'),
+            from_r=tool_call.get('from_r'),
+            to_q=tool_call.get('to_q'),
+            to_r=tool_call.get('to_r')
+        )
 
-        elif tool == 'end_turn':
-            result = game_state.end_turn()
-            return {"type": "end_turn", **result}
+    def _do_buy(self, tool_call: dict, game_state: GameState) -> dict:
+        return game_state.buy_unit(
+            unit_type=tool_call.get('unit_type'),
+            target_q=tool_call.get('q'),
+            target_r=tool_call.get('r')
+        )
 
-        return None
+    def _do_end_turn(self, tool_call: dict, game_state: GameState) -> dict:
+        result = game_state.end_turn()
+        return {"type": "end_turn", **result}
 
 
 class GameRunner:
@@ -2,23 +2,77 @@
 from __future__ import annotations
 from dataclasses import dataclass
 from typing import TYPE_CHECKING
+import itertools
 import random
 
+from ..board import Terrain
 from ..units import UnitType, UNIT_STATS
 
 if TYPE_CHECKING:
     from ..state import GameState
-    from ..board import Hex
+    from ..board import Board, Hex
     from ..player import Player, Region
 
 
+# Score reasons are bit flags, turned into text only when displayed.
+# Bits follow the order in which the evaluators add them.
+REASON_NAMES = (
+    "attack", "attack_purchase",
+    "kill_peasant", "kill_spearman", "kill_knight", "kill_baron", "kill_castle",
+    "split_territory", "towards_capital", "efficient",
+    "frontier_defense", "castle_defense",
+    "threat_1", "threat_2", "threat_3", "threat_4",
+    "interior", "near_tree", "chop_tree", "chop_tree_urgent", "expand",
+    "merge_save_upkeep", "merge_on_frontier", "move_to_frontier", "spread_out",
+    "can_afford", "early_game", "no_region", "would_starve",
+)
+REASON_ATTACK = 1 << 0
+REASON_ATTACK_PURCHASE = 1 << 1
+REASON_KILL = {
+    UnitType.PEASANT: 1 << 2,
+    UnitType.SPEARMAN: 1 << 3,
+    UnitType.KNIGHT: 1 << 4,
+    UnitType.BARON: 1 << 5,
+    UnitType.CASTLE: 1 << 6,
+}
+REASON_SPLIT_TERRITORY = 1 << 7
+REASON_TOWARDS_CAPITAL = 1 << 8
+REASON_EFFICIENT = 1 << 9
+REASON_FRONTIER_DEFENSE = 1 << 10
+REASON_CASTLE_DEFENSE = 1 << 11
+REASON_THREAT = (0, 1 << 12, 1 << 13, 1 << 14, 1 << 15)  # Indexed by threat strength
+REASON_INTERIOR = 1 << 16
+REASON_NEAR_TREE = 1 << 17
+REASON_CHOP_TREE = 1 << 18
+REASON_CHOP_TREE_URGENT = 1 << 19
+REASON_EXPAND = 1 << 20
+REASON_MERGE_SAVE_UPKEEP = 1 << 21
+REASON_MERGE_ON_FRONTIER = 1 << 22
+REASON_MOVE_TO_FRONTIER = 1 << 23
+REASON_SPREAD_OUT = 1 << 24
+REASON_CAN_AFFORD = 1 << 25
+REASON_EARLY_GAME = 1 << 26
+REASON_NO_REGION = 1 << 27
+REASON_WOULD_STARVE = 1 << 28
+
+
+def reason_to_str(reason: int) -> str:
+    """Decode a reason bit mask, e.g. "attack+kill_peasant"."""
+    names = [name for i, name in enumerate(REASON_NAMES) if reason >> i & 1]
+    return "+".join(names) if names else "none"
+
+
 @dataclass
 class ScoredMove:
     """A move with its heuristic score."""
     from_hex: Hex
     to_hex: Hex
     score: float
-    reason: str
+    reason: int
+
+    @property
+    def reason_str(self) -> str:
+        return reason_to_str(self.reason)
 
 
 @dataclass
@@ -27,9 +81,13 @@ class ScoredPurchase:
     unit_type: UnitType
     target_hex: Hex
     score: float
-    reason: str
+    reason: int
     is_attack: bool
 
+    @property
+    def reason_str(self) -> str:
+        return reason_to_str(self.reason)
+
 
 class ClassicAI:
     """Heuristic-based AI that plays Slay using strategic rules."""
@@ -38,10 +96,24 @@ class ClassicAI:
         self.player_id = player_id
         self.difficulty = difficulty
         self.randomness = {"easy": 0.3, "normal": 0.1, "hard": 0.0}.get(difficulty, 0.1)
+        # Cumulative pick weights for the top 1, 2 and 3 candidates
+        self._cum_weights = [
+            list(itertools.accumulate(1.0 - i * self.randomness for i in range(top_n)))
+            for top_n in (1, 2, 3)
+        ]
+        # Board-derived lookups, valid until the next executed action
+        self._neighborhood_cache: dict[Hex, tuple[bool, int, int]] = {}
+        self._capital_cache: dict[int, list[Hex]] = {}
+        self._region_index: dict[int, Region] | None = None
+        self._economy_cache: dict[int, tuple[int, int, int]] = {}
+        # Distance tables depend only on the grid, kept for the board's lifetime
+        self._dist_board: Board | None = None
+        self._capital_dists: dict[Hex, list[int]] = {}
 
     def play_turn(self, state: GameState) -> list[dict]:
         """Play a complete turn, returning list of actions taken."""
         actions = []
+        self._clear_caches()
 
         # Phase 1: Execute attacks with existing units
         actions.extend(self._execute_attacks(state))
@@ -56,32 +128,15 @@ class ClassicAI:
 
     def _execute_attacks(self, state: GameState) -> list[dict]:
         """Execute attack moves with existing units."""
-        actions = []
-        for _ in range(50):
-            scored_moves = self._score_moves(state)
-            attack_moves = [m for m in scored_moves
-                           if m.to_hex.owner != self.player_id and m.score > 0]
-
-            if not attack_moves:
-                break
-
-            move = self._pick_best(attack_moves)
-            if not move:
-                break
-
-            result = state.move_unit(
-                move.from_hex.q, move.from_hex.r,
-                move.to_hex.q, move.to_hex.r
-            )
-            if result["success"]:
-                actions.append(result)
-            else:
-                break
-
-        return actions
+        return self._execute_moves(state, attack=True, max_actions=50)
 
     def _execute_purchases(self, state: GameState) -> list[dict]:
-        """Buy units strategically."""
+        """Buy units strategically.
+
+        Every purchase is rescored after each buy: a buy changes the paying
+        region's gold and can merge regions or weaken enemy defenses, which
+        affects purchases anywhere on the board.
+        """
         actions = []
         for _ in range(20):
             scored_purchases = self._score_purchases(state)
@@ -97,36 +152,40 @@ class ClassicAI:
                 purchase.target_hex.q,
                 purchase.target_hex.r
             )
-            if result["success"]:
-                actions.append(result)
-            else:
+            if not result["success"]:
                 break
+            actions.append(result)
+            self._clear_caches()
 
         return actions
 
     def _execute_repositioning(self, state: GameState) -> list[dict]:
         """Move units internally to better positions."""
-        actions = []
-        for _ in range(30):
-            scored_moves = self._score_moves(state)
-            internal_moves = [m for m in scored_moves
-                             if m.to_hex.owner == self.player_id and m.score > 0]
+        return self._execute_moves(state, attack=False, max_actions=30)
 
-            if not internal_moves:
-                break
+    def _execute_moves(self, state: GameState, attack: bool,
+                       max_actions: int) -> list[dict]:
+        """Execute the best attack (or internal) moves, one at a time."""
+        player = state.rules.get_player(self.player_id)
+        if not player or player.movable_units == 0:
+            return []
 
-            move = self._pick_best(internal_moves)
-            if not move:
+        actions = []
+        for _ in range(max_actions):
+            moves = [m for m in self._score_moves(state)
+                     if (m.to_hex.owner != self.player_id) == attack and m.score > 0]
+            if not moves:
                 break
 
+            move = self._pick_best(moves)
             result = state.move_unit(
                 move.from_hex.q, move.from_hex.r,
                 move.to_hex.q, move.to_hex.r
             )
-            if result["success"]:
-                actions.append(result)
-            else:
+            if not result["success"]:
                 break
+            actions.append(result)
+            self._clear_caches()
 
         return actions
 
@@ -144,58 +203,59 @@ class ClassicAI:
         return sorted(scored, key=lambda m: -m.score)
 
     def _evaluate_move(self, state: GameState, from_hex: Hex, to_hex: Hex,
-                       player: Player) -> tuple[float, str]:
-        """Evaluate a single move."""
+                       player: Player) -> tuple[float, int]:
+        """Evaluate a single move. Returns (score, reason flags)."""
         unit = from_hex.unit
         score = 0.0
-        reasons = []
+        reason = 0
 
         # Attack enemy territory
         if to_hex.owner is not None and to_hex.owner != self.player_id:
             score += 10.0
-            reasons.append("attack")
+            reason |= REASON_ATTACK
 
             if to_hex.unit:
                 score += to_hex.unit.strength * 5
-                reasons.append(f"kill_{to_hex.unit.type.value}")
+                reason |= REASON_KILL[to_hex.unit.type]
 
             enemy = state.rules.get_player(to_hex.owner)
             if enemy:
                 split_bonus = self._estimate_split_value(state, to_hex, enemy)
                 score += split_bonus
                 if split_bonus > 0:
-                    reasons.append("split_territory")
+                    reason |= REASON_SPLIT_TERRITORY
 
-                for region in enemy.regions:
-                    capital = region.capital_hex
-                    if capital and to_hex.distance_to(capital) < from_hex.distance_to(capital):
+                for capital in self._capitals(enemy):
+                    dists = self._distances_from(state, capital)
+                    if dists[to_hex.index] < dists[from_hex.index]:
                         score += 3.0
-                        reasons.append("towards_capital")
+                        reason |= REASON_TOWARDS_CAPITAL
                         break
 
         # Capture neutral
         elif to_hex.owner is None:
-            if to_hex.terrain.value == "tree" and unit.type == UnitType.PEASANT:
+            if to_hex.terrain is Terrain.TREE and unit.type == UnitType.PEASANT:
                 score += 2.0
-                reasons.append("chop_tree")
+                reason |= REASON_CHOP_TREE
             else:
                 score += 1.0
-                reasons.append("expand")
+                reason |= REASON_EXPAND
 
         # Internal movement (own territory)
         else:
             # Chop trees in own territory to increase income
-            if to_hex.terrain.value == "tree":
+            if to_hex.terrain is Terrain.TREE:
                 # Find region to check income situation
                 region = self._find_region_for_hex(state, to_hex, state.rules.get_player(self.player_id), False)
                 if region:
                     # High priority if income <= upkeep (need more income)
-                    if region.income <= region.get_upkeep():
+                    income, upkeep, _ = self._economy(region)
+                    if income <= upkeep:
                         score += 5.0
-                        reasons.append("chop_tree_urgent")
+                        reason |= REASON_CHOP_TREE_URGENT
                     else:
                         score += 2.0
-                        reasons.append("chop_tree")
+                        reason |= REASON_CHOP_TREE
 
             elif to_hex.unit and unit.can_merge_with(to_hex.unit):
                 merged_upkeep = UNIT_STATS[self._get_upgrade(unit.type)]["upkeep"]
@@ -203,21 +263,21 @@ class ClassicAI:
 
                 if merged_upkeep < old_upkeep:
                     score += 2.0
-                    reasons.append("merge_save_upkeep")
+                    reason |= REASON_MERGE_SAVE_UPKEEP
                 elif self._is_frontier(state, to_hex):
                     score += 1.5
-                    reasons.append("merge_on_frontier")
+                    reason |= REASON_MERGE_ON_FRONTIER
 
             elif self._is_frontier(state, to_hex) and not self._is_frontier(state, from_hex):
                 score += 1.0
-                reasons.append("move_to_frontier")
+                reason |= REASON_MOVE_TO_FRONTIER
 
             elif self._count_friendly_units_nearby(state, from_hex) > 2:
                 if self._count_friendly_units_nearby(state, to_hex) < 2:
                     score += 0.5
-                    reasons.append("spread_out")
+                    reason |= REASON_SPREAD_OUT
 
-        return score, "+".join(reasons) if reasons else "none"
+        return score, reason
 
     def _score_purchases(self, state: GameState) -> list[ScoredPurchase]:
         """Score all valid purchases."""
@@ -236,84 +296,84 @@ class ClassicAI:
 
     def _evaluate_purchase(self, state: GameState, unit_type: UnitType,
                           target_hex: Hex, region_gold: int, is_attack: bool,
-                          player: Player) -> tuple[float, str]:
-        """Evaluate a purchase."""
+                          player: Player) -> tuple[float, int]:
+        """Evaluate a purchase. Returns (score, reason flags)."""
         cost = UNIT_STATS[unit_type]["cost"]
         upkeep = UNIT_STATS[unit_type]["upkeep"]
         strength = UNIT_STATS[unit_type]["strength"]
 
         score = 0.0
-        reasons = []
+        reason = 0
 
         region = self._find_region_for_hex(state, target_hex, player, is_attack)
         if not region:
-            return -100, "no_region"
+            return -100, REASON_NO_REGION
 
         # Check economic sustainability
-        future_income = region.income + (1 if is_attack else 0)
-        future_upkeep = region.get_upkeep() + upkeep
+        income, region_upkeep, trees_in_region = self._economy(region)
+        future_income = income + (1 if is_attack else 0)
+        future_upkeep = region_upkeep + upkeep
         gold_after = region_gold - cost
 
-        # Count trees in region - unit can chop trees to increase income
-        trees_in_region = sum(1 for h in region.hexes if h.terrain.value == "tree")
+        # Trees in region - unit can chop trees to increase income
         potential_income = future_income + min(trees_in_region, 1)  # Can chop at least 1 tree
 
         if gold_after + potential_income < future_upkeep:
             turns_until_starve = gold_after / max(1, future_upkeep - potential_income)
             if turns_until_starve < 2:
-                return -50, "would_starve"
+                return -50, REASON_WOULD_STARVE
 
         # Attack purchases are high priority
         if is_attack:
             score += 15.0
-            reasons.append("attack_purchase")
+            reason |= REASON_ATTACK_PURCHASE
 
             if target_hex.unit:
                 score += target_hex.unit.strength * 4
-                reasons.append(f"kill_{target_hex.unit.type.value}")
+                reason |= REASON_KILL[target_hex.unit.type]
 
             defense = state.rules.get_defense_strength(target_hex)
             overkill = strength - defense - 1
             if overkill == 0:
                 score += 3.0
-                reasons.append("efficient")
+                reason |= REASON_EFFICIENT
             elif overkill > 0:
                 score -= overkill * 2
 
         # Defensive purchases on frontier
         elif self._is_frontier(state, target_hex):
             score += 5.0
-            reasons.append("frontier_defense")
+            reason |= REASON_FRONTIER_DEFENSE
 
             if unit_type == UnitType.CASTLE:
                 score += 5.0
-                reasons.append("castle_defense")
+                reason |= REASON_CASTLE_DEFENSE
 
             threat = self._assess_threat(state, target_hex)
             score += threat * 2
             if threat > 0:
-                reasons.append(f"threat_{threat}")
+                reason |= REASON_THREAT[threat]
 
         else:
             score += 1.0
-            reasons.append("interior")
+            reason |= REASON_INTERIOR
 
             if unit_type == UnitType.PEASANT:
                 for neighbor in state.board.neighbors(target_hex):
-                    if neighbor.terrain.value == "tree":
+                    if neighbor.terrain is Terrain.TREE:
                         score += 2.0
-                        reasons.append("near_tree")
+                        reason |= REASON_NEAR_TREE
                         break
 
         if region_gold > cost * 2:
             score += 2.0
-            reasons.append("can_afford")
+            reason |= REASON_CAN_AFFORD
 
         if unit_type == UnitType.PEASANT and state.turn < 10:
             score += 2.0
-            reasons.append("early_game")
+            reason |= REASON_EARLY_GAME
 
-        return score, "+".join(reasons) if reasons else "none"
+        return score, reason
 
     def _pick_best(self, items: list) -> any:
         """Pick the best item, with some randomness based on difficulty."""
@@ -324,15 +384,59 @@ class ClassicAI:
             return items[0]
 
         top_n = min(3, len(items))
-        weights = [1.0 - i * self.randomness for i in range(top_n)]
-        return random.choices(items[:top_n], weights=weights)[0]
+        return random.choices(items[:top_n], cum_weights=self._cum_weights[top_n - 1])[0]
+
+    def _clear_caches(self):
+        """Drop board-derived lookups after the board changed."""
+        self._neighborhood_cache.clear()
+        self._capital_cache.clear()
+        self._region_index = None
+        self._economy_cache.clear()
+
+    def _capitals(self, player: Player) -> list[Hex]:
+        """Capital hexes of a player's regions (cached until the board changes)."""
+        capitals = self._capital_cache.get(player.id)
+        if capitals is None:
+            capitals = [cap for r in player.regions if (cap := r.capital_hex)]
+            self._capital_cache[player.id] = capitals
+        return capitals
+
+    def _distances_from(self, state: GameState, capital: Hex) -> list[int]:
+        """Distance from a hex to every board hex, indexed by hex index."""
+        if self._dist_board is not state.board:
+            self._dist_board = state.board
+            self._capital_dists = {}
+        dists = self._capital_dists.get(capital)
+        if dists is None:
+            dists = state.board.distances_from(capital)
+            self._capital_dists[capital] = dists
+        return dists
+
+    def _neighborhood(self, state: GameState, h: Hex) -> tuple[bool, int, int]:
+        """Summarize a hex's neighbors in one pass: (is_frontier, friendly_units, max_threat).
+
+        Cached until the board changes (the cache is cleared after each action).
+        """
+        info = self._neighborhood_cache.get(h)
+        if info is None:
+            frontier = False
+            friendly_units = 0
+            max_threat = 0
+            for neighbor in state.board.neighbors(h):
+                if neighbor.owner == self.player_id:
+                    if neighbor.unit:
+                        friendly_units += 1
+                    continue
+                frontier = True
+                if neighbor.owner is not None and neighbor.unit:
+                    max_threat = max(max_threat, neighbor.unit.strength)
+            info = (frontier, friendly_units, max_threat)
+            self._neighborhood_cache[h] = info
+        return info
 
     def _is_frontier(self, state: GameState, h: Hex) -> bool:
         """Check if hex is on the frontier."""
-        for neighbor in state.board.neighbors(h):
-            if neighbor.owner != self.player_id:
-                return True
-        return False
+        return self._neighborhood(state, h)[0]
 
     def _estimate_split_value(self, state: GameState, target: Hex, enemy: Player) -> float:
         """Estimate value of conquering this hex for splitting enemy territory."""
@@ -346,32 +450,39 @@ class ClassicAI:
 
     def _count_friendly_units_nearby(self, state: GameState, h: Hex) -> int:
         """Count friendly units in adjacent hexes."""
-        return sum(1 for n in state.board.neighbors(h)
-                   if n.owner == self.player_id and n.unit)
+        return self._neighborhood(state, h)[1]
 
     def _assess_threat(self, state: GameState, h: Hex) -> int:
         """Assess enemy threat level to a hex."""
-        max_threat = 0
-        for neighbor in state.board.neighbors(h):
-            if neighbor.owner is not None and neighbor.owner != self.player_id:
-                if neighbor.unit:
-                    max_threat = max(max_threat, neighbor.unit.strength)
-        return max_threat
+        return self._neighborhood(state, h)[2]
 
     def _find_region_for_hex(self, state: GameState, target: Hex,
                             player: Player, is_attack: bool) -> Region | None:
         """Find which region would contain this hex."""
+        regions = self._hex_regions(player)
         if is_attack:
             for neighbor in state.board.neighbors(target):
                 if neighbor.owner == self.player_id:
-                    for region in player.regions:
-                        if neighbor in region.hexes:
-                            return region
-        else:
-            for region in player.regions:
-                if target in region.hexes:
-                    return region
-        return None
+                    region = regions.get(neighbor.index)
+                    if region:
+                        return region
+            return None
+        return regions.get(target.index)
+
+    def _economy(self, region: Region) -> tuple[int, int, int]:
+        """Region (income, upkeep, tree count), cached until the board changes."""
+        economy = self._economy_cache.get(id(region))
+        if economy is None:
+            trees = sum(1 for h in region.hexes if h.terrain is Terrain.TREE)
+            economy = (region.income, region.get_upkeep(), trees)
+            self._economy_cache[id(region)] = economy
+        return economy
+
+    def _hex_regions(self, player: Player) -> dict[int, Region]:
+        """Map hex index -> own region (cached until the board changes)."""
+        if self._region_index is None:
+            self._region_index = {h.index: r for r in player.regions for h in r.hexes}
+        return self._region_index
 
     def _get_upgrade(self, unit_type: UnitType) -> UnitType:
         """Get the upgrade for a unit type."""
@@ -12,15 +12,35 @@ class Terrain(Enum):
     GRAVE = "grave"
 
 
-@dataclass(eq=False)
+# Plain lookups for (de)serialization; Enum .value and Terrain(...) are slow per hex
+_TERRAIN_VALUE = {t: t.value for t in Terrain}
+_TERRAIN_BY_VALUE = {t.value: t for t in Terrain}
+
+# Count of Hex terrain/unit writes; cached per-region figures are keyed on it
+_hex_changes = 0
+
+
+def hex_changes() -> int:
+    """Current count of hex terrain/unit writes (changes whenever either is set)."""
+    return _hex_changes
+
+
+@dataclass(eq=False, slots=True)
 class Hex:
     q: int  # axial coordinate
     r: int  # axial coordinate
     terrain: Terrain = Terrain.LAND
     owner: int | None = None  # player_id or None
     unit: Unit | None = None
+    index: int | None = field(default=None, repr=False)  # Position in the board's neighbor table
     # Note: capitals are now dynamic - any territory of 2+ hexes has a capital
 
+    def __setattr__(self, name, value):
+        object.__setattr__(self, name, value)
+        if name == "terrain" or name == "unit":
+            global _hex_changes
+            _hex_changes += 1
+
     def __hash__(self):
         return hash((self.q, self.r))
 
@@ -34,20 +54,22 @@ class Hex:
         return -self.q - self.r
 
     def distance_to(self, other: Hex) -> int:
-        return (abs(self.q - other.q) + abs(self.r - other.r) + abs(self.s - other.s)) // 2
+        dq = self.q - other.q
+        dr = self.r - other.r
+        return (abs(dq) + abs(dr) + abs(dq + dr)) // 2
 
     def to_dict(self) -> dict:
         return {
             "q": self.q,
             "r": self.r,
-            "terrain": self.terrain.value,
+            "terrain": _TERRAIN_VALUE[self.terrain],
             "owner": self.owner,
             "unit": self.unit.to_dict() if self.unit else None,
         }
 
 
 # Import here to avoid circular dependency
-from .units import Unit
+from .units import Unit, UnitType
 
 
 # Directions for hex neighbors (axial coordinates)
@@ -66,6 +88,7 @@ class Board:
     def __post_init__(self):
         if not self.hexes:
             self._generate_empty_board()
+        self._build_neighbor_table()
 
     def _generate_empty_board(self):
         for r in range(self.height):
@@ -73,6 +96,72 @@ class Board:
             for q in range(-r_offset, self.width - r_offset):
                 self.hexes[(q, r)] = Hex(q=q, r=r)
 
+    def _build_neighbor_table(self):
+        """Index hexes and precompute their neighbors (the grid never changes shape).
+
+        Coordinates are hashed once here; everything else is derived from
+        the per-direction index table.
+        """
+        self._hex_list: list[Hex] = list(self.hexes.values())
+        for i, h in enumerate(self._hex_list):
+            h.index = i
+        self._qs = [h.q for h in self._hex_list]
+        self._rs = [h.r for h in self._hex_list]
+        # Neighbor index per HEX_DIRECTIONS entry, -1 off the board
+        hexes = self.hexes
+        self._direction_indices: list[tuple[int, ...]] = [
+            tuple(
+                neighbor.index if (neighbor := hexes.get((h.q + dq, h.r + dr))) else -1
+                for dq, dr in HEX_DIRECTIONS
+            )
+            for h in self._hex_list
+        ]
+        # Same table without the gaps, as flat indices and as Hex objects
+        self._neighbor_indices: list[tuple[int, ...]] = [
+            tuple(j for j in directions if j >= 0) for directions in self._direction_indices
+        ]
+        hex_list = self._hex_list
+        self._neighbor_table: list[tuple[Hex, ...]] = [
+            tuple(hex_list[j] for j in indices) for indices in self._neighbor_indices
+        ]
+        self._label_owners: list[int | None] | None = None
+        self._labels: list[int] = []
+        # Last record handed out per hex by to_records(), reused while unchanged
+        self._records: list[tuple | None] = [None] * len(self._hex_list)
+
+    def all_coords(self) -> tuple[list[int], list[int]]:
+        """Axial q and r of every hex, indexed by Hex.index."""
+        return self._qs, self._rs
+
+    def distances_from(self, h: Hex) -> list[int]:
+        """Distance from h to every hex, indexed by Hex.index."""
+        q, r = h.q, h.r
+        qr = q + r
+        return [(abs(hq - q) + abs(hr - r) + abs(hq + hr - qr)) // 2
+                for hq, hr in zip(self._qs, self._rs)]
+
+    def neighbor_indices(self) -> list[tuple[int, ...]]:
+        """Neighbor indices of every hex, indexed by Hex.index (same order as neighbors())."""
+        return self._neighbor_indices
+
+    def owner_array(self) -> list[int | None]:
+        """Snapshot of every hex owner, indexed by Hex.index."""
+        return [h.owner for h in self._hex_list]
+
+    def __getstate__(self):
+        # Only the hexes' own fields; index and neighbor tables are rebuilt on load
+        return self.width, self.height, [
+            (h.q, h.r, _TERRAIN_VALUE[h.terrain], h.owner, h.unit) for h in self._hex_list
+        ]
+
+    def __setstate__(self, state):
+        self.width, self.height, hexes = state
+        self.hexes = {
+            (q, r): Hex(q=q, r=r, terrain=_TERRAIN_BY_VALUE[terrain], owner=owner, unit=unit)
+            for q, r, terrain, owner, unit in hexes
+        }
+        self._build_neighbor_table()
+
     def get(self, q: int, r: int) -> Hex | None:
         return self.hexes.get((q, r))
 
@@ -80,62 +169,139 @@ class Board:
         return self.hexes.get(coords)
 
     def __iter__(self) -> Iterator[Hex]:
-        return iter(self.hexes.values())
+        return iter(self._hex_list)
 
-    def neighbors(self, h: Hex) -> list[Hex]:
-        result = []
-        for dq, dr in HEX_DIRECTIONS:
-            neighbor = self.get(h.q + dq, h.r + dr)
-            if neighbor:
-                result.append(neighbor)
-        return result
+    def neighbors(self, h: Hex) -> tuple[Hex, ...]:
+        return self._neighbor_table[self._index_of(h)]
+
+    def _index_of(self, h: Hex) -> int:
+        """Table index of h; hexes the board did not build are looked up by coordinates."""
+        if h.index is None:
+            return self.hexes[(h.q, h.r)].index
+        return h.index
 
     def get_territory(self, player_id: int) -> list[Hex]:
-        return [h for h in self.hexes.values() if h.owner == player_id]
+        return [h for h in self._hex_list if h.owner == player_id]
 
     def get_region(self, start: Hex) -> set[Hex]:
         """Get all connected hexes of the same owner starting from start."""
         if start.owner is None:
             return set()
-
-        visited = set()
-        to_visit = [start]
+        mask = self.region_mask(start)
+        return {h for h, inside in zip(self._hex_list, mask) if inside}
+
+    def region_mask(self, start: Hex) -> bytearray:
+        """Mask (indexed by Hex.index) of the hexes connected to start with its owner.
+
+        Scanline fill: each popped seed is widened to its whole row span,
+        and only the first hex of each run in the rows above and below is
+        pushed as a new seed.
+        """
+        hex_list = self._hex_list
+        directions = self._direction_indices
         owner = start.owner
-
-        while to_visit:
-            current = to_visit.pop()
-            if current in visited:
+        seen = bytearray(len(hex_list))
+        if owner is None:
+            return seen
+        stack = [self._index_of(start)]
+
+        while stack:
+            i = stack.pop()
+            if seen[i]:
                 continue
-            if current.owner != owner:
+            # Walk west (-1, 0) to the start of the span
+            while (j := directions[i][3]) >= 0 and not seen[j] and hex_list[j].owner == owner:
+                i = j
+
+            # Row below starts at (q-1, r+1), row above ends at (q_end+1, r-1)
+            j = directions[i][4]
+            down_open = j >= 0 and not seen[j] and hex_list[j].owner == owner
+            if down_open:
+                stack.append(j)
+            up_open = False
+
+            last = i
+            while i >= 0 and not seen[i] and hex_list[i].owner == owner:
+                seen[i] = 1
+                d = directions[i]
+                j = d[2]  # (0, -1)
+                if j >= 0 and not seen[j] and hex_list[j].owner == owner:
+                    if not up_open:
+                        stack.append(j)
+                        up_open = True
+                else:
+                    up_open = False
+                j = d[5]  # (0, 1)
+                if j >= 0 and not seen[j] and hex_list[j].owner == owner:
+                    if not down_open:
+                        stack.append(j)
+                        down_open = True
+                else:
+                    down_open = False
+                last = i
+                i = d[0]  # (1, 0)
+
+            j = directions[last][1]  # (1, -1)
+            if not up_open and j >= 0 and not seen[j] and hex_list[j].owner == owner:
+                stack.append(j)
+
+        return seen
+
+    def _label_regions(self) -> list[int]:
+        """Label connected same-owner hexes for all players in one union-find pass.
+
+        Labels are cached against the owner snapshot they were computed from,
+        so repeated calls between ownership changes are a single list compare.
+        """
+        owners = self.owner_array()
+        if owners == self._label_owners:
+            return self._labels
+
+        parent = list(range(len(owners)))
+
+        def find(i: int) -> int:
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            return i
+
+        neighbor_indices = self._neighbor_indices
+        for i, owner in enumerate(owners):
+            if owner is None:
                 continue
-            visited.add(current)
-            for neighbor in self.neighbors(current):
-                if neighbor not in visited and neighbor.owner == owner:
-                    to_visit.append(neighbor)
+            for j in neighbor_indices[i]:
+                if j < i and owners[j] == owner:
+                    ri, rj = find(i), find(j)
+                    if ri != rj:
+                        parent[max(ri, rj)] = min(ri, rj)
 
-        return visited
+        self._labels = [find(i) if owner is not None else -1 for i, owner in enumerate(owners)]
+        self._label_owners = owners
+        return self._labels
 
     def get_regions(self, player_id: int) -> list[set[Hex]]:
         """Get all distinct regions for a player."""
-        territory = self.get_territory(player_id)
-        visited = set()
-        regions = []
-
-        for h in territory:
-            if h not in visited:
-                region = self.get_region(h)
-                visited.update(region)
-                regions.append(region)
-
-        return regions
+        labels = self._label_regions()
+        regions: dict[int, set[Hex]] = {}
+        for h, owner in zip(self._hex_list, self._label_owners):
+            if owner == player_id:
+                regions.setdefault(labels[h.index], set()).add(h)
+        return list(regions.values())
 
     def get_frontier(self, player_id: int) -> list[Hex]:
         """Get hexes adjacent to enemy territory."""
+        owners = self.owner_array()
+        if player_id not in owners:
+            return []
+        neighbor_indices = self._neighbor_indices
+        hex_list = self._hex_list
         frontier = []
-        for h in self.get_territory(player_id):
-            for neighbor in self.neighbors(h):
-                if neighbor.owner is not None and neighbor.owner != player_id:
-                    frontier.append(h)
+        for i, owner in enumerate(owners):
+            if owner != player_id:
+                continue
+            for j in neighbor_indices[i]:
+                if owners[j] is not None and owners[j] != player_id:
+                    frontier.append(hex_list[i])
                     break
         return frontier
 
@@ -145,11 +311,10 @@ class Board:
                  tree_ratio: float = 0.03, seed: int | None = None,
                  regions_per_player: int = 5) -> Board:
         """Generate a Slay-style map: 100% filled, multiple regions per player."""
-        if seed is not None:
-            random.seed(seed)
+        rng = random.Random(seed)
 
         board = cls(width=width, height=height)
-        all_hexes = list(board.hexes.values())
+        all_hexes = board._hex_list
 
         # Add sea around edges only
         for h in all_hexes:
@@ -159,19 +324,19 @@ class Board:
                 h.terrain = Terrain.SEA
 
         # Small random sea patches
-        land_hexes = [h for h in all_hexes if h.terrain == Terrain.LAND]
+        land_hexes = [h for h in all_hexes if h.terrain is Terrain.LAND]
         num_sea = int(len(land_hexes) * sea_ratio)
-        for h in random.sample(land_hexes, min(num_sea, len(land_hexes))):
+        for h in rng.sample(land_hexes, min(num_sea, len(land_hexes))):
             h.terrain = Terrain.SEA
 
-        land_hexes = [h for h in all_hexes if h.terrain == Terrain.LAND]
+        land_hexes = [h for h in all_hexes if h.terrain is Terrain.LAND]
         if not land_hexes:
             return board
 
         # Create multiple seeds per player (scattered across the map)
         all_seeds = []  # List of (hex, player_id)
         available = land_hexes.copy()
-        random.shuffle(available)
+        rng.shuffle(available)
 
         total_seeds = num_players * regions_per_player
         for i in range(min(total_seeds, len(available))):
@@ -183,26 +348,28 @@ class Board:
         # Note: capitals are now dynamic - any territory of 2+ hexes has a capital
 
         # Grow all seeds simultaneously (Voronoi-style)
-        unclaimed = [h for h in land_hexes if h.owner is None]
-        seed_territories = {i: [h] for i, (h, _) in enumerate(all_seeds)}
+        unclaimed_count = sum(1 for h in land_hexes if h.owner is None)
+
+        def land_neighbors(h: Hex) -> list[Hex]:
+            return [n for n in board.neighbors(h) if n.terrain is Terrain.LAND]
 
-        while unclaimed:
+        # Each seed's frontier is kept incrementally, in territory order, and
+        # only compacted when sampled (same candidates as a full rebuild)
+        seed_frontiers = [land_neighbors(h) for h, _ in all_seeds]
+
+        while unclaimed_count:
             grew = False
             for seed_idx, (_, player_id) in enumerate(all_seeds):
-                if not unclaimed:
+                if not unclaimed_count:
                     break
-                # Find frontier for this seed's territory
-                frontier = []
-                for h in seed_territories[seed_idx]:
-                    for neighbor in board.neighbors(h):
-                        if neighbor.terrain == Terrain.LAND and neighbor.owner is None:
-                            frontier.append(neighbor)
+                frontier = [h for h in seed_frontiers[seed_idx] if h.owner is None]
                 if frontier:
-                    new_hex = random.choice(frontier)
+                    new_hex = rng.choice(frontier)
                     new_hex.owner = player_id
-                    seed_territories[seed_idx].append(new_hex)
-                    unclaimed.remove(new_hex)
+                    frontier.extend(land_neighbors(new_hex))
+                    unclaimed_count -= 1
                     grew = True
+                seed_frontiers[seed_idx] = frontier
             if not grew:
                 break
 
@@ -210,33 +377,91 @@ class Board:
         # Trees stay owned but generate no income (Slay rules)
         owned_hexes = [h for h in land_hexes if h.owner is not None and h.unit is None]
         num_trees = int(len(owned_hexes) * tree_ratio)
-        for h in random.sample(owned_hexes, min(num_trees, len(owned_hexes))):
+        for h in rng.sample(owned_hexes, min(num_trees, len(owned_hexes))):
             h.terrain = Terrain.TREE
             # Keep owner - trees on owned land stay owned
 
         return board
 
-    def to_dict(self) -> dict:
+    def to_dict(self, capitals: set[tuple[int, int]] | None = None) -> dict:
+        """Serialize the board; with capitals, each hex also gets has_capital."""
+        hexes = {}
+        for h in self._hex_list:
+            hex_data = h.to_dict()
+            if capitals is not None:
+                hex_data["has_capital"] = (h.q, h.r) in capitals
+            hexes[f"{h.q},{h.r}"] = hex_data
         return {
             "width": self.width,
             "height": self.height,
-            "hexes": {f"{q},{r}": h.to_dict() for (q, r), h in self.hexes.items()}
+            "hexes": hexes,
         }
 
     @classmethod
     def from_dict(cls, data: dict) -> Board:
         """Reconstruct board from serialized data."""
-        board = cls(width=data["width"], height=data["height"])
-        board.hexes = {}
+        hexes = {}
         for key, hex_data in data["hexes"].items():
             q, r = map(int, key.split(","))
-            h = Hex(q=q, r=r)
-            h.terrain = Terrain(hex_data["terrain"])
-            h.owner = hex_data["owner"]
-            if hex_data.get("unit"):
-                h.unit = Unit.from_dict(hex_data["unit"])
-            board.hexes[(q, r)] = h
-        return board
+            unit_data = hex_data.get("unit")
+            hexes[(q, r)] = Hex(
+                q=q, r=r,
+                terrain=_TERRAIN_BY_VALUE[hex_data["terrain"]],
+                owner=hex_data["owner"],
+                unit=Unit.from_dict(unit_data) if unit_data else None,
+            )
+        if not hexes:
+            board = cls(width=data["width"], height=data["height"])
+            board.hexes = {}
+            board._build_neighbor_table()
+            return board
+        # Passing the hexes in skips building (and indexing) an empty grid first
+        return cls(width=data["width"], height=data["height"], hexes=hexes)
+
+    def to_records(self) -> tuple[int, int, tuple[tuple, ...]]:
+        """Immutable board state: (width, height, one record per hex).
+
+        A record is (q, r, terrain, owner, unit_type, unit_owner, unit_moved).
+        Hexes unchanged since the previous call get the very same tuple back,
+        so successive snapshots share them instead of holding copies.
+        """
+        cache = self._records
+        records = []
+        for i, h in enumerate(self._hex_list):
+            unit = h.unit
+            if unit is None:
+                record = (h.q, h.r, _TERRAIN_VALUE[h.terrain], h.owner, None, None, False)
+            else:
+                record = (h.q, h.r, _TERRAIN_VALUE[h.terrain], h.owner,
+                          unit.type.value, unit.owner, unit.has_moved)
+            cached = cache[i]
+            if record == cached:
+                record = cached
+            else:
+                cache[i] = record
+            records.append(record)
+        return self.width, self.height, tuple(records)
+
+    @classmethod
+    def from_records(cls, data) -> Board:
+        """Reconstruct board from to_records() output (lists also accepted, as after JSON)."""
+        width, height, records = data
+        hexes = {
+            (q, r): Hex(
+                q=q, r=r,
+                terrain=_TERRAIN_BY_VALUE[terrain],
+                owner=owner,
+                unit=Unit(type=UnitType(unit_type), owner=unit_owner, has_moved=unit_moved)
+                if unit_type is not None else None,
+            )
+            for q, r, terrain, owner, unit_type, unit_owner, unit_moved in records
+        }
+        if not hexes:
+            board = cls(width=width, height=height)
+            board.hexes = {}
+            board._build_neighbor_table()
+            return board
+        return cls(width=width, height=height, hexes=hexes)
 
     def to_ascii(self) -> str:
         """ASCII representation for debugging."""
@@ -5,7 +5,7 @@ from typing import Literal
 import json
 
 
-@dataclass
+@dataclass(slots=True)
 class PlayerConfig:
     """Configuration for a single player."""
     controller_type: Literal["human", "classic_ai", "llm_ai"]
@@ -26,7 +26,7 @@ class PlayerConfig:
         return cls(**data)
 
 
-@dataclass
+@dataclass(slots=True)
 class MapConfig:
     """Map generation configuration."""
     width: int = 15
@@ -56,7 +56,7 @@ class MapConfig:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class GameConfig:
     """Complete game configuration."""
     players: list[PlayerConfig]
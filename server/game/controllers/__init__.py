@@ -1,4 +1,12 @@
 """Player controller abstractions."""
+import sys
+from pathlib import Path
+
+# The LLM controller imports the top-level ai package, which lives in the server directory
+_SERVER_DIR = str(Path(__file__).parent.parent.parent)
+if _SERVER_DIR not in sys.path:
+    sys.path.insert(0, _SERVER_DIR)
+
 from .base import PlayerController, PlayerType
 from .classic_ai import ClassicAIController
 from .llm_ai import LLMController
@@ -2,7 +2,7 @@
 from __future__ import annotations
 from abc import ABC, abstractmethod
 from enum import Enum
-from typing import TYPE_CHECKING, Callable, Awaitable
+from typing import TYPE_CHECKING, Callable, Awaitable, ClassVar
 
 if TYPE_CHECKING:
     from ..state import GameState
@@ -17,20 +17,12 @@ class PlayerType(Enum):
 class PlayerController(ABC):
     """Interface for player control (human or AI)."""
 
+    player_type: ClassVar[PlayerType]  # Set by each concrete controller
+    is_async: ClassVar[bool] = False  # True if controller waits for external input (human)
+
     def __init__(self, player_id: int):
         self.player_id = player_id
 
-    @property
-    @abstractmethod
-    def player_type(self) -> PlayerType:
-        """Return the type of this controller."""
-        pass
-
-    @property
-    def is_async(self) -> bool:
-        """True if controller waits for external input (human)."""
-        return False
-
     @abstractmethod
     async def play_turn(
         self,
@@ -12,15 +12,13 @@ if TYPE_CHECKING:
 class ClassicAIController(PlayerController):
     """Wrapper around ClassicAI heuristic engine."""
 
+    player_type = PlayerType.CLASSIC_AI
+
     def __init__(self, player_id: int, difficulty: str = "normal"):
         super().__init__(player_id)
         self.difficulty = difficulty
         self._ai = ClassicAI(player_id, difficulty)
 
-    @property
-    def player_type(self) -> PlayerType:
-        return PlayerType.CLASSIC_AI
-
     async def play_turn(
         self,
         game_state: GameState,
@@ -12,6 +12,9 @@ if TYPE_CHECKING:
 class HumanController(PlayerController):
     """Controller that waits for human input via API."""
 
+    player_type = PlayerType.HUMAN
+    is_async = True
+
     def __init__(self, player_id: int):
         super().__init__(player_id)
         self._pending_action: asyncio.Future | None = None
@@ -20,14 +23,6 @@ class HumanController(PlayerController):
         self._game_state = None
         self._on_action = None
 
-    @property
-    def player_type(self) -> PlayerType:
-        return PlayerType.HUMAN
-
-    @property
-    def is_async(self) -> bool:
-        return True
-
     async def play_turn(
         self,
         game_state: GameState,
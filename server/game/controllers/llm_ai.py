@@ -1,11 +1,6 @@
 """LLM-based AI controller using Claude."""
 from __future__ import annotations
 from typing import TYPE_CHECKING, Callable, Awaitable
-import sys
-from pathlib import Path
-
-# Add server dir to path for ai imports
-sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent))
 
 from .base import PlayerController, PlayerType
 
@@ -16,23 +11,17 @@ if TYPE_CHECKING:
 class LLMController(PlayerController):
     """Wrapper around SlayAgent (Claude-powered)."""
 
+    player_type = PlayerType.LLM_AI
+
     def __init__(self, player_id: int, color_name: str,
                  model: str = "claude-sonnet-4-20250514"):
         super().__init__(player_id)
         self.color_name = color_name
         self.model = model
-        self._agent = None  # Lazy init to avoid import issues
-
-    def _get_agent(self):
-        """Lazily initialize the SlayAgent."""
-        if self._agent is None:
-            from ai.agent import SlayAgent
-            self._agent = SlayAgent(self.player_id, self.color_name, self.model)
-        return self._agent
-
-    @property
-    def player_type(self) -> PlayerType:
-        return PlayerType.LLM_AI
+        # Imported here: ai.agent imports the game package, which imports this module
+        from ai.agent import SlayAgent
+        # Cheap to build: the SDK itself is only loaded on the agent's first turn
+        self._agent = SlayAgent(player_id, color_name, model)
 
     async def play_turn(
         self,
@@ -40,7 +29,7 @@ class LLMController(PlayerController):
         on_action: Callable[[dict], Awaitable[None]] | None = None
     ) -> list[dict]:
         """Execute turn using Claude LLM."""
-        agent = self._get_agent()
+        agent = self._agent
 
         # Convert on_action to on_message format expected by SlayAgent
         async def on_message(msg):
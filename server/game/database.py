@@ -1,16 +1,47 @@
 """SQLite database for game persistence."""
+import asyncio
+import itertools
 import sqlite3
 import json
+import threading
+import zlib
 from pathlib import Path
 from datetime import datetime
 
 DB_PATH = Path(__file__).parent.parent.parent / "data" / "yals.db"
 
+# Compact encoder for stored state (no whitespace, no cycle checks on plain dicts)
+_dumps = json.JSONEncoder(separators=(",", ":"), check_circular=False).encode
 
-def get_connection():
-    DB_PATH.parent.mkdir(parents=True, exist_ok=True)
-    conn = sqlite3.connect(str(DB_PATH))
-    conn.row_factory = sqlite3.Row
+
+_local = threading.local()
+
+# SQL is kept constant so sqlite3's per-connection statement cache reuses it
+_INSERT_GAME = """
+    INSERT INTO games (created_at, updated_at, turn, config_json, state_json, history_blob,
+                       player_count, board_preview_json)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+"""
+# history_json is only kept for rows saved before history_blob existed
+_UPDATE_GAME = """
+    UPDATE games SET updated_at=?, turn=?, config_json=?, state_json=?,
+                     history_json=NULL, history_blob=?, player_count=?, board_preview_json=?
+    WHERE id=?
+"""
+
+
+def get_connection() -> sqlite3.Connection:
+    """Return this thread's connection, opening and configuring it once."""
+    conn = getattr(_local, "conn", None)
+    if conn is None:
+        DB_PATH.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(str(DB_PATH))
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.execute("PRAGMA cache_size=-20000")
+        _local.conn = conn
     return conn
 
 
@@ -28,60 +59,170 @@ def init_db():
             history_json TEXT
         )
     """)
+    # Columns added after the original schema:
+    # - history is stored compressed (it grows every turn and is never queried)
+    # - list_games reads player count and a terrain/owner-only board preview directly
+    columns = {row["name"] for row in conn.execute("PRAGMA table_info(games)")}
+    for name, sql_type in (("history_blob", "BLOB"),
+                           ("player_count", "INTEGER"),
+                           ("board_preview_json", "TEXT")):
+        if name not in columns:
+            conn.execute(f"ALTER TABLE games ADD COLUMN {name} {sql_type}")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_games_updated ON games(updated_at DESC)")
+    conn.commit()
+
+
+def _board_preview(board: dict) -> dict:
+    """Strip a serialized board down to what the saved-games thumbnail draws."""
+    return {
+        "hexes": {
+            key: {"terrain": h["terrain"], "owner": h["owner"]}
+            for key, h in board["hexes"].items()
+        }
+    }
+
+
+def _encode_game(orchestrator) -> tuple:
+    """Serialize an orchestrator into the column values after updated_at."""
+    data = orchestrator.to_dict()
+    config_json = _dumps(data["config"])
+    state_json = _dumps(data["game_state"])
+    # History JSON is built from cached fragments; only new entries get encoded
+    history = orchestrator.history
+    history_blob = zlib.compress(history.to_json().encode(), 1) if history else None
+    preview_json = _dumps(_board_preview(data["game_state"]["board"]))
+    return (orchestrator.game_state.turn, config_json, state_json, history_blob,
+            len(data["config"]["players"]), preview_json)
+
+
+def _write_game(row: tuple, game_id: int | None) -> int:
+    """Write an encoded game row. Returns game ID."""
+    conn = get_connection()
+    now = datetime.now().isoformat()
+    if game_id:
+        conn.execute(_UPDATE_GAME, (now, *row, game_id))
+    else:
+        game_id = conn.execute(_INSERT_GAME, (now, now, *row)).lastrowid
     conn.commit()
-    conn.close()
+    return game_id
 
 
 def save_game(orchestrator, game_id: int | None = None) -> int:
     """Save current game state. Returns game ID."""
     if not orchestrator or not orchestrator.game_state:
         return None
+    return _write_game(_encode_game(orchestrator), game_id)
+
+
+async def save_game_async(orchestrator, game_id: int | None = None) -> int:
+    """Save from the event loop: encode here, write on a worker thread."""
+    if not orchestrator or not orchestrator.game_state:
+        return None
+    # Encoding must not race with game mutations, so only the write is offloaded
+    row = _encode_game(orchestrator)
+    return await asyncio.to_thread(_write_game, row, game_id)
+
+
+# Auto-saves are debounced: within the window only the latest state of each game is written
+SAVE_DEBOUNCE_S = 0.1
+SAVE_RETRY_S = 1.0  # Wait after a failed write before trying again
+# game_id -> (orchestrator, request number); a new tuple per request tells later
+# requests apart from the one a write covered
+_pending_saves: dict[int, tuple[object, int]] = {}
+_save_requests = itertools.count()
+_writer_task: asyncio.Task | None = None
+
 
+def schedule_save(orchestrator, game_id: int) -> None:
+    """Queue an auto-save of an existing game (must be called from the event loop)."""
+    global _writer_task
+    if not orchestrator or not orchestrator.game_state or not game_id:
+        return
+    _pending_saves[game_id] = (orchestrator, next(_save_requests))
+    if _writer_task is None or _writer_task.done():
+        _writer_task = asyncio.get_running_loop().create_task(_run_writer())
+
+
+async def _run_writer():
+    """Write pending saves in batches until none are left, retrying failed writes."""
+    while _pending_saves:
+        await asyncio.sleep(SAVE_DEBOUNCE_S)
+        if not await _write_pending():
+            await asyncio.sleep(SAVE_RETRY_S)
+
+
+async def _write_pending() -> bool:
+    """Write every pending save in one batch. Returns False if the write failed."""
+    entries = dict(_pending_saves)
+    batch = [(_encode_game(orchestrator), game_id)
+             for game_id, (orchestrator, _) in entries.items()]
+    try:
+        await asyncio.to_thread(_write_batch, batch)
+    except Exception as e:
+        print(f"Auto-save of games {sorted(entries)} failed: {e}")
+        return False
+    # Keep saves requested while the batch was being written
+    for game_id, entry in entries.items():
+        if _pending_saves.get(game_id) is entry:
+            del _pending_saves[game_id]
+    return True
+
+
+async def flush_saves() -> bool:
+    """Write pending auto-saves now, e.g. at shutdown. Returns False if the write failed."""
+    if _writer_task is not None and not _writer_task.done():
+        _writer_task.cancel()
+        try:
+            await _writer_task
+        except asyncio.CancelledError:
+            pass
+    if not _pending_saves:
+        return True
+    return await _write_pending()
+
+
+def _write_batch(batch: list[tuple[tuple, int]]):
+    """Write several encoded games in a single transaction."""
     conn = get_connection()
     now = datetime.now().isoformat()
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        for row, game_id in batch:
+            conn.execute(_UPDATE_GAME, (now, *row, game_id))
+    except Exception:
+        conn.rollback()
+        raise
+    conn.commit()
 
-    data = orchestrator.to_dict()
-    config_json = json.dumps(data["config"])
-    state_json = json.dumps(data["game_state"])
-    history_json = json.dumps(data["history"]) if data["history"] else None
 
-    if game_id:
-        # Update existing game
-        conn.execute("""
-            UPDATE games SET updated_at=?, turn=?, config_json=?, state_json=?, history_json=?
-            WHERE id=?
-        """, (now, orchestrator.game_state.turn, config_json, state_json, history_json, game_id))
+def _row_to_game(row: sqlite3.Row) -> dict:
+    """Decode a games row into config, state and history dicts."""
+    if row["history_blob"]:
+        history = json.loads(zlib.decompress(row["history_blob"]))
+    elif row["history_json"]:
+        history = json.loads(row["history_json"])
     else:
-        # Insert new game
-        cursor = conn.execute("""
-            INSERT INTO games (created_at, updated_at, turn, config_json, state_json, history_json)
-            VALUES (?, ?, ?, ?, ?, ?)
-        """, (now, now, orchestrator.game_state.turn, config_json, state_json, history_json))
-        game_id = cursor.lastrowid
-
-    conn.commit()
-    conn.close()
-    return game_id
+        history = None
+    return {
+        "config": json.loads(row["config_json"]),
+        "state": json.loads(row["state_json"]),
+        "history": history,
+    }
 
 
 def load_last_game() -> dict | None:
     """Load most recent game. Returns dict with config, state, history or None."""
     conn = get_connection()
     cursor = conn.execute("""
-        SELECT config_json, state_json, history_json FROM games
+        SELECT config_json, state_json, history_json, history_blob FROM games
         ORDER BY updated_at DESC LIMIT 1
     """)
     row = cursor.fetchone()
-    conn.close()
 
     if not row:
         return None
 
-    return {
-        "config": json.loads(row["config_json"]),
-        "state": json.loads(row["state_json"]),
-        "history": json.loads(row["history_json"]) if row["history_json"] else None,
-    }
+    return _row_to_game(row)
 
 
 def new_game_slot():
@@ -89,16 +230,17 @@ def new_game_slot():
     conn = get_connection()
     # Insert a new row instead of deleting all
     conn.commit()
-    conn.close()
 
 
 def list_games(limit: int = 10) -> list[dict]:
     """List recent games."""
     conn = get_connection()
+    # Rows saved before the denormalized columns fall back to parsing the JSON
     cursor = conn.execute("""
         SELECT id, created_at, updated_at, turn,
-               json_extract(config_json, '$.players') as players_json,
-               json_extract(state_json, '$.board') as board_json
+               COALESCE(player_count, json_array_length(config_json, '$.players'), 0)
+                   as player_count,
+               COALESCE(board_preview_json, json_extract(state_json, '$.board')) as board_json
         FROM games
         ORDER BY updated_at DESC
         LIMIT ?
@@ -106,17 +248,15 @@ def list_games(limit: int = 10) -> list[dict]:
 
     games = []
     for row in cursor:
-        players = json.loads(row["players_json"]) if row["players_json"] else []
         games.append({
             "id": row["id"],
             "created_at": row["created_at"],
             "updated_at": row["updated_at"],
             "turn": row["turn"],
-            "player_count": len(players),
+            "player_count": row["player_count"],
             "board": json.loads(row["board_json"]) if row["board_json"] else None,
         })
 
-    conn.close()
     return games
 
 
@@ -124,19 +264,14 @@ def load_game_by_id(game_id: int) -> dict | None:
     """Load a specific game by ID."""
     conn = get_connection()
     cursor = conn.execute("""
-        SELECT config_json, state_json, history_json FROM games WHERE id = ?
+        SELECT config_json, state_json, history_json, history_blob FROM games WHERE id = ?
     """, (game_id,))
     row = cursor.fetchone()
-    conn.close()
 
     if not row:
         return None
 
-    return {
-        "config": json.loads(row["config_json"]),
-        "state": json.loads(row["state_json"]),
-        "history": json.loads(row["history_json"]) if row["history_json"] else None,
-    }
+    return _row_to_game(row)
 
 
 # Initialize on import
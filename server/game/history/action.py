@@ -12,7 +12,11 @@ class ActionType(Enum):
     TURN_START = "turn_start"
 
 
-@dataclass(frozen=True)
+# Plain dict lookup; ActionType(value) goes through Enum's slower call machinery
+ACTION_TYPE_BY_VALUE = {t.value: t for t in ActionType}
+
+
+@dataclass(frozen=True, slots=True)
 class GameAction:
     """Immutable record of a game action."""
     action_type: ActionType
@@ -37,7 +41,7 @@ class GameAction:
     @classmethod
     def from_dict(cls, data: dict) -> GameAction:
         return cls(
-            action_type=ActionType(data["type"]),
+            action_type=ACTION_TYPE_BY_VALUE[data["type"]],
             player_id=data["player"],
             turn=data["turn"],
             sequence=data["seq"],
@@ -1,6 +1,8 @@
 """History manager for tracking and undoing game actions."""
 from __future__ import annotations
+from bisect import bisect_left
 from typing import TYPE_CHECKING
+import json
 
 from .action import GameAction, ActionType
 from .snapshot import StateSnapshot
@@ -8,15 +10,36 @@ from .snapshot import StateSnapshot
 if TYPE_CHECKING:
     from ..state import GameState
 
+# Turns between full board captures; snapshots in between are replayed
+SNAPSHOT_INTERVAL = 10
+
+# Same compact encoding the database uses for stored JSON
+_encode = json.JSONEncoder(separators=(",", ":"), check_circular=False).encode
+
+
+def _matches(state: GameState, snapshot: StateSnapshot) -> bool:
+    """Whether a state agrees with a snapshot's turn, current player and player totals."""
+    return (state.turn == snapshot.turn
+            and state.current_player_idx == snapshot.current_player_idx
+            and [p.to_dict(include_regions=False) for p in state.players] == snapshot.players_data)
+
 
 class HistoryManager:
     """Manages action log and snapshots for undo/replay."""
 
     def __init__(self):
         self.actions: list[GameAction] = []
-        self.snapshots: dict[int, StateSnapshot] = {}  # snapshot_id -> snapshot
+        # One snapshot per player-turn; snapshot_id i is snapshots[i - 1]
+        self.snapshots: list[StateSnapshot] = []
         self._action_sequence = 0
-        self._snapshot_sequence = 0  # Unique ID for each player-turn
+        self._last_full_turn: int | None = None
+        # Serialized forms, kept in step with actions/snapshots as entries are added
+        # (entries never change once recorded, so saves reuse them as they are)
+        self._action_dicts: list[dict] = []
+        self._snapshot_dicts: dict[str, dict] = {}
+        # Encoded JSON fragments of the entries above, extended by to_json()
+        self._action_json: list[str] = []
+        self._snapshot_json: list[str] = []
 
     def record_action(self, action_type: ActionType, player_id: int,
                      turn: int, params: dict, result: dict) -> GameAction:
@@ -30,69 +53,143 @@ class HistoryManager:
             result=result,
         )
         self.actions.append(action)
+        self._action_dicts.append(action.to_dict())
         self._action_sequence += 1
         return action
 
     def capture_snapshot(self, game_state: GameState, at_turn: int) -> int:
-        """Take a snapshot. Returns the snapshot ID."""
-        self._snapshot_sequence += 1
-        self.snapshots[self._snapshot_sequence] = StateSnapshot.capture(
-            game_state, len(self.actions)
-        )
-        return self._snapshot_sequence
+        """Take a snapshot. Returns the snapshot ID.
+
+        The board is only stored once per SNAPSHOT_INTERVAL turns; other
+        snapshots keep player totals and the action count to replay from.
+        """
+        full = (self._last_full_turn is None
+                or at_turn // SNAPSHOT_INTERVAL != self._last_full_turn // SNAPSHOT_INTERVAL)
+        if full:
+            self._last_full_turn = at_turn
+        snapshot = StateSnapshot.capture(game_state, len(self.actions), full=full)
+        self.snapshots.append(snapshot)
+        snapshot_id = len(self.snapshots)
+        self._snapshot_dicts[str(snapshot_id)] = snapshot.to_dict()
+        return snapshot_id
 
     def get_snapshot(self, snapshot_id: int) -> StateSnapshot | None:
         """Get snapshot by ID."""
-        return self.snapshots.get(snapshot_id)
+        if 0 < snapshot_id <= len(self.snapshots):
+            return self.snapshots[snapshot_id - 1]
+        return None
 
     def get_state_at_snapshot(self, snapshot_id: int) -> GameState:
         """Reconstruct state at given snapshot."""
-        if snapshot_id not in self.snapshots:
+        return self._rebuild(snapshot_id)[1]
+
+    def _rebuild(self, snapshot_id: int) -> tuple[int, GameState]:
+        """Reconstruct the state at a snapshot, replaying from the nearest full one.
+
+        Returns (ID of the snapshot actually restored, state). If the replayed
+        state disagrees with the marker's stored totals (an action missing
+        from the log), the nearest full snapshot before it is used instead.
+        """
+        target = self.get_snapshot(snapshot_id)
+        if target is None:
             raise ValueError(f"Snapshot {snapshot_id} not found")
-        return self.snapshots[snapshot_id].restore()
+        if target.is_full:
+            return snapshot_id, target.restore()
+
+        base_id = next(
+            (sid for sid in range(snapshot_id - 1, 0, -1) if self.snapshots[sid - 1].is_full),
+            None
+        )
+        if base_id is None:
+            raise ValueError(f"No full snapshot before {snapshot_id}")
+        base = self.snapshots[base_id - 1]
+        state = base.restore()
+        for action in self.actions[base.action_count:target.action_count]:
+            state.apply_action(action)
+        if _matches(state, target):
+            return snapshot_id, state
+        print(f"History: snapshot {snapshot_id} does not replay, using snapshot {base_id}")
+        return base_id, base.restore()
 
     def get_max_snapshot_id(self) -> int:
         """Get the highest snapshot ID (latest state)."""
-        return self._snapshot_sequence
+        return len(self.snapshots)
 
     def undo_to_snapshot(self, snapshot_id: int) -> GameState:
         """Return state at snapshot and truncate history."""
-        state = self.get_state_at_snapshot(snapshot_id)
-        snapshot = self.snapshots[snapshot_id]
+        snapshot_id, state = self._rebuild(snapshot_id)
+        snapshot = self.snapshots[snapshot_id - 1]
 
         # Remove actions after this snapshot
-        self.actions = self.actions[:snapshot.action_count]
+        del self.actions[snapshot.action_count:]
         self._action_sequence = len(self.actions)
+        del self._action_dicts[snapshot.action_count:]
+        del self._action_json[snapshot.action_count:]
 
         # Remove snapshots after this one
-        self.snapshots = {sid: s for sid, s in self.snapshots.items() if sid <= snapshot_id}
-        self._snapshot_sequence = snapshot_id
+        for sid in range(snapshot_id + 1, len(self.snapshots) + 1):
+            del self._snapshot_dicts[str(sid)]
+        del self.snapshots[snapshot_id:]
+        del self._snapshot_json[snapshot_id:]
+        self._last_full_turn = self._latest_full_turn()
 
         return state
 
+    def _latest_full_turn(self) -> int | None:
+        """Turn of the most recent full snapshot, if any."""
+        return next((s.turn for s in reversed(self.snapshots) if s.is_full), None)
+
+    def _turn_start(self, turn: int) -> int:
+        """Index of the first action at or after turn (actions are recorded in turn order)."""
+        return bisect_left(self.actions, turn, key=lambda a: a.turn)
+
     def get_actions(self, from_turn: int = 0) -> list[dict]:
         """Get action history from specified turn."""
-        return [a.to_dict() for a in self.actions if a.turn >= from_turn]
+        return self._action_dicts[self._turn_start(from_turn):]
 
     def get_turn_actions(self, turn: int) -> list[dict]:
         """Get all actions for a specific turn."""
-        return [a.to_dict() for a in self.actions if a.turn == turn]
+        return self._action_dicts[self._turn_start(turn):self._turn_start(turn + 1)]
 
     def to_dict(self) -> dict:
+        """Serialized history. The lists/dicts are shared with the manager: read only."""
         return {
-            "actions": [a.to_dict() for a in self.actions],
-            "snapshots": {str(sid): s.to_dict() for sid, s in self.snapshots.items()},
-            "snapshot_sequence": self._snapshot_sequence,
+            "actions": self._action_dicts,
+            "snapshots": self._snapshot_dicts,
+            "snapshot_sequence": len(self.snapshots),
         }
 
+    def to_json(self) -> str:
+        """Compact JSON of to_dict(); only entries added since the last call are encoded."""
+        action_json = self._action_json
+        action_json.extend(map(_encode, self._action_dicts[len(action_json):]))
+        snapshot_json = self._snapshot_json
+        snapshot_dicts = self._snapshot_dicts
+        for sid in range(len(snapshot_json) + 1, len(self.snapshots) + 1):
+            key = str(sid)
+            snapshot_json.append(f"{_encode(key)}:{_encode(snapshot_dicts[key])}")
+        return (
+            f'{{"actions":[{",".join(action_json)}],'
+            f'"snapshots":{{{",".join(snapshot_json)}}},'
+            f'"snapshot_sequence":{len(self.snapshots)}}}'
+        )
+
     @classmethod
     def from_dict(cls, data: dict) -> HistoryManager:
         manager = cls()
-        manager.actions = [GameAction.from_dict(a) for a in data["actions"]]
-        manager.snapshots = {
-            int(sid): StateSnapshot.from_dict(s)
-            for sid, s in data["snapshots"].items()
-        }
+        action_dicts = data["actions"]
+        manager.actions = [GameAction.from_dict(a) for a in action_dicts]
+        # Stored keyed by snapshot ID (1..n) for compatibility with older saves
+        snapshot_dicts = [
+            s for _, s in sorted(data["snapshots"].items(), key=lambda item: int(item[0]))
+        ]
+        manager.snapshots = [StateSnapshot.from_dict(s) for s in snapshot_dicts]
         manager._action_sequence = len(manager.actions)
-        manager._snapshot_sequence = data.get("snapshot_sequence", len(manager.snapshots))
+        manager._last_full_turn = manager._latest_full_turn()
+        # The loaded dicts already are the serialized form: keep them rather than
+        # serializing every entry again
+        manager._action_dicts = list(action_dicts)
+        manager._snapshot_dicts = {
+            str(sid): s for sid, s in enumerate(snapshot_dicts, start=1)
+        }
         return manager
@@ -9,26 +9,38 @@ if TYPE_CHECKING:
 
 @dataclass
 class StateSnapshot:
-    """Complete game state at a point in time (start of turn)."""
+    """Game state at a point in time (start of turn).
+
+    Only full snapshots carry the board; the others are markers that are
+    rebuilt by replaying actions from the nearest full snapshot before them.
+    """
     turn: int
     current_player_idx: int
-    board_data: dict
+    board_data: tuple | dict | None  # Board.to_records(); dict in older saves
     players_data: list[dict]
     action_count: int
 
+    @property
+    def is_full(self) -> bool:
+        return self.board_data is not None
+
     @classmethod
-    def capture(cls, game_state: GameState, action_count: int) -> StateSnapshot:
-        """Capture current game state."""
+    def capture(cls, game_state: GameState, action_count: int,
+                full: bool = True) -> StateSnapshot:
+        """Capture current game state (player totals only unless full)."""
         return cls(
             turn=game_state.turn,
             current_player_idx=game_state.current_player_idx,
-            board_data=game_state.board.to_dict(),
-            players_data=[p.to_dict() for p in game_state.players],
+            board_data=game_state.board.to_records() if full else None,
+            # Region details are rebuilt from the board on restore; only totals are read
+            players_data=[p.to_dict(include_regions=False) for p in game_state.players],
             action_count=action_count,
         )
 
     def restore(self) -> GameState:
-        """Reconstruct GameState from snapshot."""
+        """Reconstruct GameState from a full snapshot."""
+        if not self.is_full:
+            raise ValueError("Cannot restore a marker snapshot without replay")
         from ..state import GameState
         return GameState.from_snapshot(self)
 
@@ -46,7 +58,7 @@ class StateSnapshot:
         return cls(
             turn=data["turn"],
             current_player_idx=data["current_player_idx"],
-            board_data=data["board"],
+            board_data=data.get("board"),
             players_data=data["players"],
             action_count=data["action_count"],
         )
@@ -2,6 +2,7 @@
 import random
 import math
 from dataclasses import dataclass
+from functools import lru_cache
 from .board import Board, Hex, Terrain
 
 
@@ -32,53 +33,61 @@ def _lerp(a: float, b: float, t: float) -> float:
     return a + t * (b - a)
 
 
+# Gradient signs per hash & 3: (x+y, -x+y, x-y, -x-y)
+_GRAD_SX = (1.0, -1.0, 1.0, -1.0)
+_GRAD_SY = (1.0, 1.0, -1.0, -1.0)
+
+
 def _grad(hash_val: int, x: float, y: float) -> float:
     """Gradient function for 2D Perlin noise."""
     h = hash_val & 3
-    if h == 0:
-        return x + y
-    elif h == 1:
-        return -x + y
-    elif h == 2:
-        return x - y
-    else:
-        return -x - y
+    return _GRAD_SX[h] * x + _GRAD_SY[h] * y
 
 
 class PerlinNoise:
     """2D Perlin noise generator."""
 
-    def __init__(self, seed: int = 0):
+    def __init__(self, seed: int = 0, rng: random.Random | None = None):
         self.perm = list(range(256))
-        random.seed(seed)
-        random.shuffle(self.perm)
+        (rng or random.Random(seed)).shuffle(self.perm)
         self.perm = self.perm + self.perm  # Double for overflow
 
     def noise(self, x: float, y: float) -> float:
         """Generate noise value at (x, y), returns -1 to 1."""
-        # Grid cell coordinates
-        xi = int(math.floor(x)) & 255
-        yi = int(math.floor(y)) & 255
+        # Grid cell coordinates (floor once; _fade/_lerp/_grad are inlined below)
+        fx = math.floor(x)
+        fy = math.floor(y)
+        xi = fx & 255
+        yi = fy & 255
 
         # Relative position in cell
-        xf = x - math.floor(x)
-        yf = y - math.floor(y)
+        xf = x - fx
+        yf = y - fy
 
         # Fade curves
-        u = _fade(xf)
-        v = _fade(yf)
+        u = xf * xf * xf * (xf * (xf * 6 - 15) + 10)
+        v = yf * yf * yf * (yf * (yf * 6 - 15) + 10)
 
         # Hash coordinates of corners
-        aa = self.perm[self.perm[xi] + yi]
-        ab = self.perm[self.perm[xi] + yi + 1]
-        ba = self.perm[self.perm[xi + 1] + yi]
-        bb = self.perm[self.perm[xi + 1] + yi + 1]
+        perm = self.perm
+        pa = perm[xi] + yi
+        pb = perm[xi + 1] + yi
+        aa = perm[pa] & 3
+        ab = perm[pa + 1] & 3
+        ba = perm[pb] & 3
+        bb = perm[pb + 1] & 3
 
         # Blend gradients
-        x1 = _lerp(_grad(aa, xf, yf), _grad(ba, xf - 1, yf), u)
-        x2 = _lerp(_grad(ab, xf, yf - 1), _grad(bb, xf - 1, yf - 1), u)
+        xm = xf - 1
+        ym = yf - 1
+        g_aa = _GRAD_SX[aa] * xf + _GRAD_SY[aa] * yf
+        g_ba = _GRAD_SX[ba] * xm + _GRAD_SY[ba] * yf
+        g_ab = _GRAD_SX[ab] * xf + _GRAD_SY[ab] * ym
+        g_bb = _GRAD_SX[bb] * xm + _GRAD_SY[bb] * ym
+        x1 = g_aa + u * (g_ba - g_aa)
+        x2 = g_ab + u * (g_bb - g_ab)
 
-        return _lerp(x1, x2, v)
+        return x1 + v * (x2 - x1)
 
     def octave_noise(self, x: float, y: float, octaves: int = 4, persistence: float = 0.5) -> float:
         """Multi-octave noise for more natural terrain."""
@@ -95,137 +104,204 @@ class PerlinNoise:
 
         return total / max_value
 
+    def octave_noise_grid(self, points: list[tuple[float, float]], octaves: int = 4,
+                          persistence: float = 0.5) -> list[float]:
+        """octave_noise for many points at once (same values, batch evaluated).
 
-def _distance_to_center(q: int, r: int, width: int, height: int) -> float:
-    """Normalized distance from hex to map center (0 = center, 1 = corner)."""
-    # Convert axial to approximate cartesian for distance calc
-    x = q + r / 2
-    y = r * 0.866  # sqrt(3)/2
-
-    center_x = width / 2
-    center_y = height * 0.866 / 2
+        The per-point helpers are inlined and each octave is one pass over
+        all points, which avoids several Python calls per sample.
+        """
+        perm = self.perm
+        floor = math.floor
+        totals = [0.0] * len(points)
+        frequency = 1.0
+        amplitude = 1.0
+        max_value = 0.0
 
-    dx = (x - center_x) / (width / 2)
-    dy = (y - center_y) / (height * 0.866 / 2)
+        for _ in range(octaves):
+            for i, (px, py) in enumerate(points):
+                x = px * frequency
+                y = py * frequency
+                fx = floor(x)  # already an int
+                fy = floor(y)
+                xi = fx & 255
+                yi = fy & 255
+                xf = x - fx
+                yf = y - fy
+                u = xf * xf * xf * (xf * (xf * 6 - 15) + 10)
+                v = yf * yf * yf * (yf * (yf * 6 - 15) + 10)
+
+                pa = perm[xi] + yi
+                pb = perm[xi + 1] + yi
+                # Gradient per corner: hash & 3 picks (x+y, -x+y, x-y, -x-y); conditional
+                # expressions measured faster than indexing _GRAD_SX/_GRAD_SY here
+                g = perm[pa] & 3
+                xm, ym = xf - 1, yf - 1
+                n_aa = (xf + yf if g == 0 else -xf + yf if g == 1 else xf - yf if g == 2 else -xf - yf)
+                g = perm[pb] & 3
+                n_ba = (xm + yf if g == 0 else -xm + yf if g == 1 else xm - yf if g == 2 else -xm - yf)
+                g = perm[pa + 1] & 3
+                n_ab = (xf + ym if g == 0 else -xf + ym if g == 1 else xf - ym if g == 2 else -xf - ym)
+                g = perm[pb + 1] & 3
+                n_bb = (xm + ym if g == 0 else -xm + ym if g == 1 else xm - ym if g == 2 else -xm - ym)
+
+                x1 = n_aa + u * (n_ba - n_aa)
+                x2 = n_ab + u * (n_bb - n_ab)
+                totals[i] += (x1 + v * (x2 - x1)) * amplitude
+            max_value += amplitude
+            amplitude *= persistence
+            frequency *= 2
 
-    return math.sqrt(dx * dx + dy * dy)
+        return [total / max_value for total in totals]
 
 
-def _get_connected_component(board: Board, start: Hex) -> set[Hex]:
-    """Get all hexes connected to start via land."""
-    visited = set()
-    to_visit = [start]
+@lru_cache(maxsize=16)
+def _island_falloff(width: int, height: int, island_falloff: float) -> tuple[float, ...]:
+    """Falloff factor per hex (in Board order): 1 at the center, dropping toward the edges.
 
-    while to_visit:
-        current = to_visit.pop()
-        if current in visited:
-            continue
-        if current.terrain == Terrain.SEA:
+    Depends only on the board shape, so it is computed once per size.
+    """
+    # Axial coords are converted to approximate cartesian; distance is normalized
+    # so 0 = center, 1 = corner
+    center_x = width / 2
+    center_y = height * 0.866 / 2  # sqrt(3)/2
+    sqrt = math.sqrt
+    falloffs = []
+    for q, r in zip(*Board(width=width, height=height).all_coords()):
+        dx = (q + r / 2 - center_x) / center_x
+        dy = (r * 0.866 - center_y) / center_y
+        falloffs.append(1 - (sqrt(dx * dx + dy * dy) * island_falloff) ** 2)
+    return tuple(falloffs)
+
+
+def _land_mask(noise_values: list[float], config: MapGenConfig) -> bytearray:
+    """Land (1) / sea (0) per hex: noise scaled by the island falloff, then thresholded."""
+    falloffs = _island_falloff(config.width, config.height, config.island_falloff)
+    land_threshold = config.land_threshold
+    # Combine noise (normalized to 0-1) and falloff; edges become sea
+    return bytearray(
+        (noise_val + 1) / 2 * falloff >= land_threshold
+        for noise_val, falloff in zip(noise_values, falloffs)
+    )
+
+
+def _largest_land_component(board: Board, is_land: bytearray) -> bytearray:
+    """Mask of the largest land-connected component (first found wins ties)."""
+    neighbor_indices = board.neighbor_indices()
+    seen = bytearray(len(is_land))
+    best: list[int] = []
+    unvisited_land = sum(is_land)
+    for start in range(len(is_land)):
+        # Components are found in one sweep; stop once none left could beat the best
+        if len(best) >= unvisited_land:
+            break
+        if not is_land[start] or seen[start]:
             continue
-        visited.add(current)
-        for neighbor in board.neighbors(current):
-            if neighbor not in visited and neighbor.terrain != Terrain.SEA:
-                to_visit.append(neighbor)
-
-    return visited
+        seen[start] = 1
+        component = [start]
+        for i in component:  # BFS: the list grows while it is walked
+            for j in neighbor_indices[i]:
+                if is_land[j] and not seen[j]:
+                    seen[j] = 1
+                    component.append(j)
+        unvisited_land -= len(component)
+        if len(component) > len(best):
+            best = component
+    mask = bytearray(len(is_land))
+    for i in best:
+        mask[i] = 1
+    return mask
 
 
 def generate_map(config: MapGenConfig) -> Board:
     """Generate a procedural island map."""
     seed = config.seed if config.seed is not None else random.randint(0, 999999)
-    random.seed(seed)
+    # Local generator: map generation must not disturb the global random state
+    rng = random.Random(seed)
 
-    noise = PerlinNoise(seed)
+    noise = PerlinNoise(seed, rng)
     board = Board(width=config.width, height=config.height)
 
-    # Phase 1: Generate terrain with Perlin noise
-    for h in board:
-        # Get noise value
-        nx = h.q * config.noise_scale
-        ny = h.r * config.noise_scale
-        noise_val = noise.octave_noise(nx, ny, config.octaves)
-
-        # Apply island falloff (edges become sea)
-        dist = _distance_to_center(h.q, h.r, config.width, config.height)
-        falloff = 1 - (dist * config.island_falloff) ** 2
-
-        # Combine noise and falloff
-        terrain_val = (noise_val + 1) / 2 * falloff  # Normalize to 0-1
-
-        if terrain_val < config.land_threshold:
-            h.terrain = Terrain.SEA
-        else:
-            h.terrain = Terrain.LAND
-
-    # Phase 2: Ensure single connected landmass
-    land_hexes = [h for h in board if h.terrain == Terrain.LAND]
-    if land_hexes:
-        # Find largest connected component
-        largest_component = set()
-        visited_all = set()
-
-        for h in land_hexes:
-            if h not in visited_all:
-                component = _get_connected_component(board, h)
-                visited_all.update(component)
-                if len(component) > len(largest_component):
-                    largest_component = component
-
-        # Remove disconnected land
-        for h in land_hexes:
-            if h not in largest_component:
-                h.terrain = Terrain.SEA
+    # Phases 1-3 work on a land mask indexed by Hex.index; terrain is written once after
+    hexes = list(board)
+    neighbor_indices = board.neighbor_indices()
+
+    # Phase 1: Generate terrain with Perlin noise (sampled for the whole grid at once)
+    qs, rs = board.all_coords()
+    scale = config.noise_scale
+    noise_values = noise.octave_noise_grid(
+        [(q * scale, r * scale) for q, r in zip(qs, rs)], config.octaves
+    )
+    is_land = _land_mask(noise_values, config)
+
+    # Phase 2: Ensure single connected landmass (remove disconnected land)
+    if any(is_land):
+        is_land = _largest_land_component(board, is_land)
 
     # Phase 3: Smooth coastline (cellular automata pass)
+    # Sea with 5+ land neighbors fills in (small bays); land with 5+ sea neighbors
+    # erodes (peninsulas). Each pass is computed from the previous mask.
+    degrees = [len(neighbors) for neighbors in neighbor_indices]
     for _ in range(2):
-        changes = []
-        for h in board:
-            land_neighbors = sum(1 for n in board.neighbors(h) if n.terrain == Terrain.LAND)
-            sea_neighbors = sum(1 for n in board.neighbors(h) if n.terrain == Terrain.SEA)
-
-            # Fill small bays (sea surrounded by land)
-            if h.terrain == Terrain.SEA and land_neighbors >= 5:
-                changes.append((h, Terrain.LAND))
-            # Erode peninsulas (land surrounded by sea)
-            elif h.terrain == Terrain.LAND and sea_neighbors >= 5:
-                changes.append((h, Terrain.SEA))
+        land_at = is_land.__getitem__
+        land_counts = [sum(map(land_at, neighbors)) for neighbors in neighbor_indices]
+        is_land = bytearray(
+            (degree - count < 5) if land else (count >= 5)
+            for land, count, degree in zip(is_land, land_counts, degrees)
+        )
 
-        for h, terrain in changes:
-            h.terrain = terrain
+    for h, land in zip(hexes, is_land):
+        h.terrain = Terrain.LAND if land else Terrain.SEA
 
     # Phase 4: Create small territories (1-3 hexes, Slay-style)
     # Territories of same player must NOT be adjacent (to stay separate)
-    land_hexes = [h for h in board if h.terrain == Terrain.LAND]
+    land_hexes = [h for h in board if h.terrain is Terrain.LAND]
     if not land_hexes:
         return board
 
-    random.shuffle(land_hexes)
-    unclaimed = set(land_hexes)
+    rng.shuffle(land_hexes)
+    # A hex is unclaimed while it is land (per is_land) with no owner; only the count is kept
+    unclaimed_count = len(land_hexes)
     player_idx = 0
 
-    def is_adjacent_to_same_player(hex, player_id):
-        """Check if hex is adjacent to any hex owned by player_id."""
-        for n in board.neighbors(hex):
-            if n.owner == player_id:
-                return True
-        return False
+    # forbidden[p][i] is set once hex i touches a hex of player p; claims never change
+    # hands in this phase, so marking neighbors on each claim keeps it exact
+    forbidden = [bytearray(len(hexes)) for _ in range(config.num_players)]
+
+    def claim(h: Hex, player_id: int):
+        nonlocal unclaimed_count
+        h.owner = player_id
+        unclaimed_count -= 1
+        marks = forbidden[player_id]
+        for j in neighbor_indices[h.index]:
+            marks[j] = 1
+
+    # Seeds are taken in the shuffled land order. A hex skipped for a player is either
+    # claimed or forbidden for them, and both are permanent, so each player's cursor
+    # only moves forward: all seed picks together are O(land) per player.
+    cursors = [0] * config.num_players
+
+    def next_seed(player_id: int) -> Hex | None:
+        """First unclaimed hex not adjacent to player_id's territory, or None."""
+        marks = forbidden[player_id]
+        i = cursors[player_id]
+        while i < len(land_hexes) and (land_hexes[i].owner is not None
+                                       or marks[land_hexes[i].index]):
+            i += 1
+        cursors[player_id] = i
+        return land_hexes[i] if i < len(land_hexes) else None
 
     # Create territories by picking seeds and growing them 0-2 hexes
-    while unclaimed:
+    while unclaimed_count:
         # Pick a seed that is NOT adjacent to same player's territory
-        candidates = [h for h in unclaimed if not is_adjacent_to_same_player(h, player_idx)]
-        if not candidates:
+        seed = next_seed(player_idx)
+        if seed is None:
             # No valid seed for this player, try next player
             player_idx = (player_idx + 1) % config.num_players
             # Check if any player can still place
-            any_valid = False
-            for p in range(config.num_players):
-                if any(not is_adjacent_to_same_player(h, p) for h in unclaimed):
-                    any_valid = True
-                    break
-            if not any_valid:
+            if all(next_seed(p) is None for p in range(config.num_players)):
                 # Assign remaining hexes - prefer player with fewest adjacent hexes
-                for h in list(unclaimed):
+                for h in [h for h in land_hexes if h.owner is None]:
                     # Count adjacent hexes per player
                     adj_count = {p: 0 for p in range(config.num_players)}
                     for n in board.neighbors(h):
@@ -233,45 +309,41 @@ def generate_map(config: MapGenConfig) -> Board:
                             adj_count[n.owner] += 1
                     # Pick player with most adjacent (to extend existing territory, not create new)
                     best_player = max(adj_count.keys(), key=lambda p: adj_count[p])
-                    h.owner = best_player
-                    unclaimed.remove(h)
+                    claim(h, best_player)
                 break
             continue
 
-        seed = random.choice(candidates)
-        unclaimed.remove(seed)
-        seed.owner = player_idx
-        territory = [seed]
+        claim(seed, player_idx)
+        territory = [seed.index]
 
         # Grow territory by 0-2 additional hexes (total size 1-3)
         # Weight towards smaller: 40% size 1, 40% size 2, 20% size 3
-        target_size = random.choices([1, 2, 3], weights=[40, 40, 20])[0]
+        target_size = rng.choices([1, 2, 3], weights=[40, 40, 20])[0]
 
         while len(territory) < target_size:
             # Find unclaimed neighbors (not adjacent to other territories of same player)
             frontier = []
-            for h in territory:
-                for neighbor in board.neighbors(h):
-                    if neighbor in unclaimed:
+            for i in territory:
+                for j in neighbor_indices[i]:
+                    if is_land[j] and hexes[j].owner is None:
                         # Check neighbor's other neighbors aren't same player
-                        other_neighbors = [n for n in board.neighbors(neighbor) if n not in territory]
-                        if not any(n.owner == player_idx for n in other_neighbors):
-                            frontier.append(neighbor)
+                        if not any(hexes[k].owner == player_idx and k not in territory
+                                   for k in neighbor_indices[j]):
+                            frontier.append(j)
             if not frontier:
                 break
             # Add one neighbor
-            new_hex = random.choice(frontier)
-            unclaimed.remove(new_hex)
-            new_hex.owner = player_idx
-            territory.append(new_hex)
+            new_index = rng.choice(frontier)
+            claim(hexes[new_index], player_idx)
+            territory.append(new_index)
 
         player_idx = (player_idx + 1) % config.num_players
 
     # Phase 6: Add trees on owned territory
-    # Trees stay owned but generate no income (Slay rules)
-    owned_hexes = [h for h in land_hexes if h.owner is not None and h.unit is None]
-    num_trees = int(len(owned_hexes) * config.tree_density)
-    for h in random.sample(owned_hexes, min(num_trees, len(owned_hexes))):
+    # Trees stay owned but generate no income (Slay rules). Phase 4 only ends once
+    # every land hex is claimed and no units exist yet, so all of land_hexes qualifies.
+    num_trees = int(len(land_hexes) * config.tree_density)
+    for h in rng.sample(land_hexes, min(num_trees, len(land_hexes))):
         h.terrain = Terrain.TREE
         # Keep owner - trees on owned land stay owned
 
@@ -5,6 +5,7 @@ from typing import Callable, Awaitable
 from .state import GameState
 from .config import GameConfig, PlayerConfig
 from .history import HistoryManager, ActionType
+from .history.action import ACTION_TYPE_BY_VALUE
 from .controllers import (
     PlayerController,
     PlayerType,
@@ -118,7 +119,7 @@ class GameOrchestrator:
         async def record_action(action: dict):
             if self.history and action.get("type"):
                 self.history.record_action(
-                    ActionType(action["type"]),
+                    ACTION_TYPE_BY_VALUE[action["type"]],
                     player.id,
                     self.game_state.turn,
                     action,
@@ -157,7 +158,7 @@ class GameOrchestrator:
         # Record in history
         if self.history and action.get("type"):
             self.history.record_action(
-                ActionType(action["type"]),
+                ACTION_TYPE_BY_VALUE[action["type"]],
                 self._waiting_for_human,
                 self.game_state.turn,
                 action,
@@ -205,7 +206,7 @@ class GameOrchestrator:
         """Get list of snapshot IDs that can be navigated to."""
         if not self.history:
             return []
-        return sorted(self.history.snapshots.keys())
+        return list(range(1, self.history.get_max_snapshot_id() + 1))
 
     def get_max_snapshot_id(self) -> int:
         """Get the latest snapshot ID."""
@@ -274,9 +275,6 @@ class GameOrchestrator:
     @classmethod
     def from_dict(cls, data: dict) -> "GameOrchestrator":
         """Restore orchestrator from saved data."""
-        from .state import GameState
-        from .history import HistoryManager
-
         config = GameConfig.from_dict(data["config"])
         orchestrator = cls(config)
 
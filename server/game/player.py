@@ -1,31 +1,46 @@
 from __future__ import annotations
 from dataclasses import dataclass, field
+import heapq
 from typing import TYPE_CHECKING
 
-from .board import Terrain
+from .board import Terrain, hex_changes
+from .units import UnitType
 
 if TYPE_CHECKING:
     from .board import Board, Hex
 
 
-COLORS = ["#F0A8A8", "#A8C8F0", "#B8E0B0", "#F0E8A8", "#D8B8E8", "#F0C8A8"]
-COLOR_NAMES = ["Rose", "Sky", "Mint", "Sunny", "Lavender", "Peach"]
+COLORS = ("#F0A8A8", "#A8C8F0", "#B8E0B0", "#F0E8A8", "#D8B8E8", "#F0C8A8")
+COLOR_NAMES = ("Rose", "Sky", "Mint", "Sunny", "Lavender", "Peach")
+_N_COLORS = len(COLORS)  # Both tables have one entry per color
 
 
-@dataclass
+@dataclass(eq=False, slots=True)
 class Region:
     """A connected group of hexes belonging to one player."""
     hexes: set[Hex]
     has_capital: bool
     gold: int = 0
+    # tally() result and the hex_changes() count it was computed at
+    _tally: tuple | None = field(default=None, init=False, repr=False, compare=False)
+    _tally_at: int = field(default=-1, init=False, repr=False, compare=False)
+    # Max gold storage: unlimited with capital, 10 without (fixed for the region's life)
+    max_gold: int = field(init=False, repr=False)
+
+    def __post_init__(self):
+        self.max_gold = 999999 if self.has_capital else 10
+
+    @property
+    def rep_hex(self) -> Hex | None:
+        """Representative hex: lowest q, then lowest r (cached with the tally)."""
+        return self.tally()[0]
 
     @property
     def capital_hex(self) -> Hex | None:
         """Return the hex where the capital is located (first hex by coordinates)."""
-        if not self.has_capital or not self.hexes:
+        if not self.has_capital:
             return None
-        # Pick deterministic hex (lowest q, then lowest r)
-        return min(self.hexes, key=lambda h: (h.q, h.r))
+        return self.rep_hex
 
     @property
     def income(self) -> int:
@@ -33,23 +48,14 @@ class Region:
 
         Capital always generates at least 1 gold.
         """
-        base = sum(1 for h in self.hexes if h.terrain not in (Terrain.TREE, Terrain.GRAVE))
+        base = self.tally()[6]
         if self.has_capital:
             return max(1, base)
         return base
 
-    @property
-    def max_gold(self) -> int:
-        """Max gold storage: unlimited with capital, 10 without."""
-        return 999999 if self.has_capital else 10
-
     def has_castle(self) -> bool:
         """Check if region has at least one castle unit (required in Slay)."""
-        from .units import UnitType
-        for h in self.hexes:
-            if h.unit and h.unit.type == UnitType.CASTLE:
-                return True
-        return False
+        return self.tally()[5]
 
     def get_territory_maintenance(self) -> int:
         """Calculate territory maintenance cost based on size (Slay rules).
@@ -63,11 +69,39 @@ class Region:
 
     def get_upkeep(self) -> int:
         """Total upkeep cost for all units in region."""
-        total = 0
+        return self.tally()[4]
+
+    def tally(self) -> tuple[Hex | None, int, int, int, int, bool, int]:
+        """One pass over the hexes for the region's derived figures.
+
+        Returns (capital-position hex, units, trees, graves, upkeep, has castle,
+        income-producing hexes); the hex is the lowest (q, r) as for capital_hex.
+        Cached until any hex's terrain or unit is next set.
+        """
+        changes = hex_changes()
+        if self._tally_at == changes:
+            return self._tally
+        rep_hex = None
+        units = trees = graves = upkeep = 0
+        has_castle = False
         for h in self.hexes:
-            if h.unit:
-                total += h.unit.upkeep
-        return total
+            if rep_hex is None or (h.q, h.r) < (rep_hex.q, rep_hex.r):
+                rep_hex = h
+            terrain = h.terrain
+            if terrain is Terrain.TREE:
+                trees += 1
+            elif terrain is Terrain.GRAVE:
+                graves += 1
+            unit = h.unit
+            if unit:
+                units += 1
+                upkeep += unit.upkeep
+                if unit.type is UnitType.CASTLE:
+                    has_castle = True
+        self._tally = (rep_hex, units, trees, graves, upkeep, has_castle,
+                       len(self.hexes) - trees - graves)
+        self._tally_at = changes
+        return self._tally
 
     def collect_income(self):
         """Collect income for this region."""
@@ -95,14 +129,14 @@ class Region:
             unit_upkeep_to_pay = unit_upkeep
 
             # Starve weakest units first
+            # (upkeep, position) heap: same order as a stable sort, but only the
+            # starved units are ever popped
             starved = []
-            units_by_upkeep = sorted(
-                [h for h in self.hexes if h.unit],
-                key=lambda h: h.unit.upkeep
-            )
+            units_by_upkeep = [(h.unit.upkeep, i, h) for i, h in enumerate(self.hexes) if h.unit]
+            heapq.heapify(units_by_upkeep)
             while remaining_gold < unit_upkeep_to_pay and units_by_upkeep:
-                h = units_by_upkeep.pop(0)
-                unit_upkeep_to_pay -= h.unit.upkeep
+                upkeep, _, h = heapq.heappop(units_by_upkeep)
+                unit_upkeep_to_pay -= upkeep
                 h.unit = None
                 h.terrain = Terrain.GRAVE
                 starved.append(h)
@@ -117,19 +151,24 @@ class Region:
             return []
 
 
-@dataclass
+@dataclass(slots=True)
 class Player:
     id: int
     color: str = ""
     color_name: str = ""
     eliminated: bool = False
     regions: list[Region] = field(default_factory=list)
+    movable_units: int = 0  # Units that can still act this turn (set at turn start)
+    # Region of every owned hex; kept in step with self.regions
+    _region_of: dict[Hex, Region] = field(default_factory=dict, init=False, repr=False, compare=False)
+    # capital_hexes() result; reset whenever self.regions is replaced
+    _capitals: set[Hex] | None = field(default=None, init=False, repr=False, compare=False)
 
     def __post_init__(self):
         if not self.color:
-            self.color = COLORS[self.id % len(COLORS)]
+            self.color = COLORS[self.id % _N_COLORS]
         if not self.color_name:
-            self.color_name = COLOR_NAMES[self.id % len(COLOR_NAMES)]
+            self.color_name = COLOR_NAMES[self.id % _N_COLORS]
 
     def update_regions(self, board: Board):
         """Recalculate regions from board state.
@@ -137,14 +176,13 @@ class Player:
         In Slay, each territory of 2+ hexes automatically has a capital.
         When territories merge, gold is combined.
         """
-        old_regions = {id(r): r for r in self.regions}
-        old_gold_by_hex = {}
-        for r in self.regions:
-            for h in r.hexes:
-                old_gold_by_hex[id(h)] = r.gold / len(r.hexes) if r.hexes else 0
+        # Old region of every hex, so merged gold is found with one lookup per hex
+        old_region_of = self._region_of
 
         region_sets = board.get_regions(self.id)
         self.regions = []
+        self._region_of = region_of = {}
+        self._capitals = None
 
         for hex_set in region_sets:
             # Territory of 2+ hexes automatically has capital
@@ -155,14 +193,32 @@ class Player:
             total_old_gold = 0
             seen_old_regions = set()
             for h in hex_set:
-                for old_r in old_regions.values():
-                    if h in old_r.hexes and id(old_r) not in seen_old_regions:
-                        total_old_gold += old_r.gold
-                        seen_old_regions.add(id(old_r))
-                        break
+                old_r = old_region_of.get(h)
+                if old_r is not None and old_r not in seen_old_regions:
+                    total_old_gold += old_r.gold
+                    seen_old_regions.add(old_r)
             region.gold = min(total_old_gold, region.max_gold)
 
             self.regions.append(region)
+            for h in hex_set:
+                region_of[h] = region
+
+    def get_region(self, h: Hex) -> Region | None:
+        """Region containing the hex, or None if the player doesn't own it."""
+        return self._region_of.get(h)
+
+    def capital_hexes(self) -> set[Hex]:
+        """Capital hex of every region that has one (cached until regions change)."""
+        if self._capitals is None:
+            self._capitals = {cap for r in self.regions if (cap := r.capital_hex)}
+        return self._capitals
+
+    def _drop_dead_regions(self, survivors: list[Region]):
+        """Keep only the surviving regions (and their hexes in the region map)."""
+        if len(survivors) != len(self.regions):
+            self._region_of = {h: r for r in survivors for h in r.hexes}
+            self._capitals = None
+        self.regions = survivors
 
     def check_castle_requirement(self) -> list[dict]:
         """Check castle requirement for all regions (Slay rules).
@@ -173,29 +229,30 @@ class Player:
         Returns list of territory deaths: [{"region_size": int, "hexes": [(q,r)], "reason": str}]
         """
         deaths = []
-        regions_to_kill = []
+        survivors = []
 
         for region in self.regions:
-            if not region.has_castle():
-                # Territory dies - all hexes become neutral, units removed
-                hex_coords = [(h.q, h.r) for h in region.hexes]
-                deaths.append({
-                    "region_size": len(region.hexes),
-                    "hexes": hex_coords,
-                    "reason": "no_castle"
-                })
-                regions_to_kill.append(region)
-
-                # Kill the territory
-                for h in region.hexes:
-                    if h.unit:
-                        h.terrain = Terrain.GRAVE
-                        h.unit = None
-                    h.owner = None
+            if region.has_castle():
+                survivors.append(region)
+                continue
+
+            # Territory dies - all hexes become neutral, units removed
+            hex_coords = [(h.q, h.r) for h in region.hexes]
+            deaths.append({
+                "region_size": len(region.hexes),
+                "hexes": hex_coords,
+                "reason": "no_castle"
+            })
+
+            # Kill the territory
+            for h in region.hexes:
+                if h.unit:
+                    h.terrain = Terrain.GRAVE
+                    h.unit = None
+                h.owner = None
 
-        # Remove dead regions
-        for region in regions_to_kill:
-            self.regions.remove(region)
+        # Drop dead regions in one pass
+        self._drop_dead_regions(survivors)
 
         return deaths
 
@@ -209,35 +266,36 @@ class Player:
         Returns list of territory deaths: [{"region_size": int, "hexes": [(q,r)], "reason": str, "needed": int, "had": int}]
         """
         deaths = []
-        regions_to_kill = []
+        survivors = []
 
         for region in self.regions:
             territory_cost = region.get_territory_maintenance()
             unit_upkeep = region.get_upkeep()
             total_cost = territory_cost + unit_upkeep
 
-            if region.gold < total_cost:
-                # Territory dies - cannot afford maintenance
-                hex_coords = [(h.q, h.r) for h in region.hexes]
-                deaths.append({
-                    "region_size": len(region.hexes),
-                    "hexes": hex_coords,
-                    "reason": "insufficient_gold",
-                    "needed": total_cost,
-                    "had": region.gold
-                })
-                regions_to_kill.append(region)
-
-                # Kill the territory
-                for h in region.hexes:
-                    if h.unit:
-                        h.terrain = Terrain.GRAVE
-                        h.unit = None
-                    h.owner = None
+            if region.gold >= total_cost:
+                survivors.append(region)
+                continue
+
+            # Territory dies - cannot afford maintenance
+            hex_coords = [(h.q, h.r) for h in region.hexes]
+            deaths.append({
+                "region_size": len(region.hexes),
+                "hexes": hex_coords,
+                "reason": "insufficient_gold",
+                "needed": total_cost,
+                "had": region.gold
+            })
+
+            # Kill the territory
+            for h in region.hexes:
+                if h.unit:
+                    h.terrain = Terrain.GRAVE
+                    h.unit = None
+                h.owner = None
 
-        # Remove dead regions
-        for region in regions_to_kill:
-            self.regions.remove(region)
+        # Drop dead regions in one pass
+        self._drop_dead_regions(survivors)
 
         return deaths
 
@@ -249,7 +307,8 @@ class Player:
         """
         deaths = []
         for region in self.regions:
-            if not region.has_capital:
+            # The cached tally says whether the region holds any unit at all
+            if not region.has_capital and region.tally()[1]:
                 for h in region.hexes:
                     if h.unit:
                         deaths.append((h, h.unit.type.value))
@@ -263,19 +322,15 @@ class Player:
     def get_total_territory(self) -> int:
         return sum(len(r.hexes) for r in self.regions)
 
+    # Unit, tree and grave counts come from the regions' cached tallies
     def get_total_units(self) -> int:
-        count = 0
-        for r in self.regions:
-            for h in r.hexes:
-                if h.unit:
-                    count += 1
-        return count
+        return sum(r.tally()[1] for r in self.regions)
 
     def get_total_trees(self) -> int:
-        return sum(1 for r in self.regions for h in r.hexes if h.terrain == Terrain.TREE)
+        return sum(r.tally()[2] for r in self.regions)
 
     def get_total_graves(self) -> int:
-        return sum(1 for r in self.regions for h in r.hexes if h.terrain == Terrain.GRAVE)
+        return sum(r.tally()[3] for r in self.regions)
 
     def start_turn(self):
         """Called at start of player's turn."""
@@ -296,38 +351,48 @@ class Player:
         self.eliminated = len(territory) == 0
         return self.eliminated
 
-    def to_dict(self) -> dict:
-        # Store gold with a representative hex coord for each region
+    def to_dict(self, include_regions: bool = True) -> dict:
+        """Serialize the player; per-region details can be left out (they are derived)."""
+        # Totals and region details come from a single tally of each region's hexes
         region_gold = {}
+        regions = []
+        total_gold = total_territory = total_units = total_trees = total_graves = 0
         for r in self.regions:
-            if r.hexes:
-                rep_hex = min(r.hexes, key=lambda h: (h.q, h.r))
+            rep_hex, units, trees, graves, upkeep, has_castle, land = r.tally()
+            # Store gold with a representative hex coord for each region
+            if rep_hex is not None:
                 region_gold[f"{rep_hex.q},{rep_hex.r}"] = r.gold
+            total_gold += r.gold
+            total_territory += len(r.hexes)
+            total_units += units
+            total_trees += trees
+            total_graves += graves
+            if include_regions:
+                regions.append({
+                    "hex_count": len(r.hexes),
+                    "has_capital": r.has_capital,
+                    "has_castle": has_castle,
+                    "gold": r.gold,
+                    "income": max(1, land) if r.has_capital else land,
+                    "upkeep": upkeep,
+                    "territory_maintenance": r.get_territory_maintenance(),
+                })
 
-        return {
+        data = {
             "id": self.id,
             "color": self.color,
             "color_name": self.color_name,
             "eliminated": self.eliminated,
-            "total_gold": self.get_total_gold(),
-            "total_territory": self.get_total_territory(),
-            "total_units": self.get_total_units(),
-            "total_trees": self.get_total_trees(),
-            "total_graves": self.get_total_graves(),
+            "total_gold": total_gold,
+            "total_territory": total_territory,
+            "total_units": total_units,
+            "total_trees": total_trees,
+            "total_graves": total_graves,
             "region_gold": region_gold,
-            "regions": [
-                {
-                    "hex_count": len(r.hexes),
-                    "has_capital": r.has_capital,
-                    "has_castle": r.has_castle(),
-                    "gold": r.gold,
-                    "income": r.income,
-                    "upkeep": r.get_upkeep(),
-                    "territory_maintenance": r.get_territory_maintenance(),
-                }
-                for r in self.regions
-            ]
         }
+        if include_regions:
+            data["regions"] = regions
+        return data
 
     @classmethod
     def from_dict(cls, data: dict, board: Board) -> Player:
@@ -341,13 +406,24 @@ class Player:
         # Rebuild regions from board state
         player.update_regions(board)
 
-        # Restore gold per region using the stored representative hex coords
-        region_gold = data.get("region_gold", {})
+        # Restore gold per region using the stored representative hex coords;
+        # "q,r" keys are only a wire format, parse them once into tuples
+        region_gold = {}
+        for key, gold in data.get("region_gold", {}).items():
+            q, _, r = key.partition(",")
+            region_gold[int(q), int(r)] = gold
         for r in player.regions:
-            if r.hexes:
-                rep_hex = min(r.hexes, key=lambda h: (h.q, h.r))
-                key = f"{rep_hex.q},{rep_hex.r}"
-                if key in region_gold:
-                    r.gold = region_gold[key]
+            rep_hex = r.rep_hex
+            if rep_hex is not None:
+                gold = region_gold.get((rep_hex.q, rep_hex.r))
+                if gold is not None:
+                    r.gold = gold
+
+        # Units still able to act are fully described by the board
+        player.movable_units = sum(
+            1 for r in player.regions for h in r.hexes
+            if h.unit and h.unit.owner == player.id
+            and h.unit.is_mobile and not h.unit.has_moved
+        )
 
         return player
@@ -2,12 +2,16 @@ from __future__ import annotations
 from dataclasses import dataclass
 from typing import TYPE_CHECKING
 
+from .board import Terrain
 from .units import Unit, UnitType, UNIT_STATS
 
 if TYPE_CHECKING:
     from .board import Board, Hex
     from .player import Player
 
+# No defense can exceed the strongest unit, so defense scans can stop there
+MAX_STRENGTH = max(stats["strength"] for stats in UNIT_STATS.values())
+
 
 @dataclass
 class MoveResult:
@@ -40,10 +44,7 @@ class GameRules:
 
     def get_region_for_hex(self, player: Player, h: Hex):
         """Find which region a hex belongs to."""
-        for region in player.regions:
-            if h in region.hexes:
-                return region
-        return None
+        return player.get_region(h)
 
     def get_defense_strength(self, target_hex: Hex) -> int:
         """Calculate defense strength of a hex.
@@ -66,24 +67,26 @@ class GameRules:
         # Unit on the hex itself
         if target_hex.unit:
             max_defense = max(max_defense, target_hex.unit.strength)
+            if max_defense >= MAX_STRENGTH:
+                return max_defense
 
         # Capital on the hex itself (strength 1)
-        if player:
-            region = self.get_region_for_hex(player, target_hex)
-            if region and region.capital_hex == target_hex:
-                max_defense = max(max_defense, 1)
+        capitals = player.capital_hexes() if player else ()
+        if target_hex in capitals:
+            max_defense = max(max_defense, 1)
 
         # Check adjacent hexes for defenders
         for neighbor in self.board.neighbors(target_hex):
             if neighbor.owner == owner:
                 # Adjacent capital - only if neighbor IS the capital hex
-                region = self.get_region_for_hex(player, neighbor) if player else None
-                if region and region.capital_hex == neighbor:
+                if neighbor in capitals:
                     max_defense = max(max_defense, 1)
 
                 # Adjacent unit
                 if neighbor.unit and neighbor.unit.owner == owner:
                     max_defense = max(max_defense, neighbor.unit.strength)
+                    if max_defense >= MAX_STRENGTH:
+                        return max_defense
 
         return max_defense
 
@@ -111,12 +114,12 @@ class GameRules:
             return False, "Target hex is not adjacent"
 
         # Check terrain
-        if to_hex.terrain.value == "sea":
+        if to_hex.terrain is Terrain.SEA:
             return False, "Cannot move to sea"
 
         # Tree/grave clearing in own territory - any unit can do it (Slay rules)
         # Counts as action (one per turn)
-        if to_hex.terrain.value in ("tree", "grave") and to_hex.owner == player_id:
+        if (to_hex.terrain is Terrain.TREE or to_hex.terrain is Terrain.GRAVE) and to_hex.owner == player_id:
             if from_hex.unit.has_moved:
                 return False, "Unit already acted this turn"
             return True, "OK"
@@ -161,6 +164,7 @@ class GameRules:
             return MoveResult(False, reason)
 
         unit = from_hex.unit
+        was_ready = not unit.has_moved
         killed_unit = None
         merged_into = None
         conquered = False
@@ -176,6 +180,8 @@ class GameRules:
             if unit.can_merge_with(to_hex.unit):
                 merged_into = Unit.merge(unit, to_hex.unit)
                 if merged_into:
+                    # Both units are consumed by the (already moved) merged unit
+                    self._spend_units(player_id, was_ready + (not to_hex.unit.has_moved))
                     to_hex.unit = merged_into
                     from_hex.unit = None
                     return MoveResult(True, f"Units merged into {merged_into.type.value}",
@@ -184,8 +190,8 @@ class GameRules:
                 return MoveResult(False, "Cannot merge units of different types")
 
         # Handle tree chopping / grave clearing
-        if to_hex.terrain.value in ("tree", "grave"):
-            to_hex.terrain = to_hex.terrain.__class__("land")  # Convert to land
+        if to_hex.terrain is Terrain.TREE or to_hex.terrain is Terrain.GRAVE:
+            to_hex.terrain = Terrain.LAND  # Convert to land
             unit.has_moved = True  # Counts as attack action
 
         # Execute move
@@ -200,8 +206,8 @@ class GameRules:
             to_hex.owner = player_id
 
             # Clear graves when capturing (Slay rules)
-            if to_hex.terrain.value == "grave":
-                to_hex.terrain = to_hex.terrain.__class__("land")
+            if to_hex.terrain is Terrain.GRAVE:
+                to_hex.terrain = Terrain.LAND
 
             # Recalculate regions for affected players
             player = self.get_player(player_id)
@@ -212,9 +218,18 @@ class GameRules:
                 if old_player:
                     old_player.update_regions(self.board)
 
+        if was_ready and unit.has_moved:
+            self._spend_units(player_id, 1)
+
         return MoveResult(True, "Move successful", killed_unit=killed_unit,
                          conquered_hex=conquered)
 
+    def _spend_units(self, player_id: int, count: int):
+        """Track units that used up their action this turn."""
+        player = self.get_player(player_id)
+        if player:
+            player.movable_units = max(0, player.movable_units - count)
+
     def can_buy(self, player_id: int, unit_type: UnitType,
                 target_hex: Hex) -> tuple[bool, str, any]:
         """Check if a unit can be purchased and placed.
@@ -233,10 +248,10 @@ class GameRules:
 
         # Cannot place on graves in own territory (must clear first)
         # But CAN attack enemy territory with graves (grave clears on capture)
-        if target_hex.terrain.value == "grave" and target_hex.owner == player_id:
+        if target_hex.terrain is Terrain.GRAVE and target_hex.owner == player_id:
             return False, "Clear the grave first", None
 
-        if target_hex.terrain.value == "sea":
+        if target_hex.terrain is Terrain.SEA:
             return False, "Cannot place unit on sea", None
 
         new_unit_strength = UNIT_STATS[unit_type]["strength"]
@@ -292,8 +307,8 @@ class GameRules:
         paying_region.gold -= cost
 
         # Clear tree if buying on one (chop)
-        if target_hex.terrain.value == "tree":
-            target_hex.terrain = target_hex.terrain.__class__("land")
+        if target_hex.terrain is Terrain.TREE:
+            target_hex.terrain = Terrain.LAND
 
         # Kill enemy unit if present
         killed = None
@@ -308,8 +323,8 @@ class GameRules:
             target_hex.owner = player_id
 
             # Clear graves when capturing (Slay rules)
-            if target_hex.terrain.value == "grave":
-                target_hex.terrain = target_hex.terrain.__class__("land")
+            if target_hex.terrain is Terrain.GRAVE:
+                target_hex.terrain = Terrain.LAND
 
             # Update regions
             player.update_regions(self.board)
@@ -333,15 +348,25 @@ class GameRules:
     def get_valid_moves(self, player_id: int) -> list[tuple[Hex, Hex]]:
         """Get all valid moves for a player."""
         moves = []
-        territory = self.board.get_territory(player_id)
+        for from_hex in self.board.get_territory(player_id):
+            # Most hexes hold no unit ready to act; skip them without a call
+            unit = from_hex.unit
+            if unit and not unit.has_moved:
+                moves.extend(self.get_valid_moves_from(player_id, from_hex))
 
-        for from_hex in territory:
-            if from_hex.unit and from_hex.unit.owner == player_id and not from_hex.unit.has_moved:
-                for to_hex in self.board.neighbors(from_hex):
-                    can, _ = self.can_move(player_id, from_hex, to_hex)
-                    if can:
-                        moves.append((from_hex, to_hex))
+        return moves
+
+    def get_valid_moves_from(self, player_id: int, from_hex: Hex) -> list[tuple[Hex, Hex]]:
+        """Get all valid moves for the unit on a single hex."""
+        unit = from_hex.unit
+        if not unit or unit.owner != player_id or unit.has_moved:
+            return []
 
+        moves = []
+        for to_hex in self.board.neighbors(from_hex):
+            can, _ = self.can_move(player_id, from_hex, to_hex)
+            if can:
+                moves.append((from_hex, to_hex))
         return moves
 
     def get_valid_purchases(self, player_id: int) -> list[tuple[UnitType, Hex, int, bool]]:
@@ -351,6 +376,23 @@ class GameRules:
         if not player:
             return purchases
 
+        # Attack targets (enemy hexes adjacent to our territory), walked once for
+        # all unit types: (paying region, target hex, defense) in board order
+        targets = []
+        defense_of = {}
+        neighbors = self.board.neighbors
+        for region in player.regions:
+            for h in region.hexes:
+                for neighbor in neighbors(h):
+                    if (neighbor.owner is not None and
+                        neighbor.owner != player_id and
+                        neighbor.terrain is not Terrain.SEA):
+                        # Defense strength (includes adjacent defenders)
+                        defense = defense_of.get(neighbor)
+                        if defense is None:
+                            defense = defense_of[neighbor] = self.get_defense_strength(neighbor)
+                        targets.append((region, neighbor, defense))
+
         for unit_type in UnitType:
             cost = UNIT_STATS[unit_type]["cost"]
             strength = UNIT_STATS[unit_type]["strength"]
@@ -359,38 +401,40 @@ class GameRules:
             for region in player.regions:
                 if region.gold >= cost:
                     for h in region.hexes:
-                        if h.unit is None and h.terrain.value not in ("sea", "grave"):
+                        if h.unit is None and h.terrain is not Terrain.SEA and h.terrain is not Terrain.GRAVE:
                             purchases.append((unit_type, h, region.gold, False))
 
-            # Attack purchases (place on enemy hex adjacent to our territory)
-            for region in player.regions:
-                if region.gold >= cost:
-                    for h in region.hexes:
-                        for neighbor in self.board.neighbors(h):
-                            if (neighbor.owner is not None and
-                                neighbor.owner != player_id and
-                                neighbor.terrain.value != "sea"):
-                                # Check defense strength (includes adjacent defenders)
-                                defense = self.get_defense_strength(neighbor)
-                                if strength > defense:
-                                    purchases.append((unit_type, neighbor, region.gold, True))
-
-        # Remove duplicates
-        seen = set()
-        unique = []
-        for p in purchases:
-            key = (p[0], p[1].q, p[1].r)
-            if key not in seen:
-                seen.add(key)
-                unique.append(p)
-
-        return unique
+            # Attack purchases; a target reachable from several hexes is listed once
+            seen = set()
+            for region, target, defense in targets:
+                if region.gold >= cost and strength > defense and target not in seen:
+                    seen.add(target)
+                    purchases.append((unit_type, target, region.gold, True))
+
+        return purchases
+
+    def get_valid_purchases_at(self, player_id: int,
+                               target_hex: Hex) -> list[tuple[UnitType, Hex, int, bool]]:
+        """Get all valid purchases on a single hex. Same tuples as get_valid_purchases."""
+        purchases = []
+        for unit_type in UnitType:
+            can, _, paying_region = self.can_buy(player_id, unit_type, target_hex)
+            if can:
+                is_attack = target_hex.owner != player_id
+                purchases.append((unit_type, target_hex, paying_region.gold, is_attack))
+        return purchases
 
     def reset_units_for_turn(self, player_id: int):
         """Reset all units for a player at start of their turn."""
+        movable = 0
         for h in self.board.get_territory(player_id):
             if h.unit and h.unit.owner == player_id:
                 h.unit.reset_for_turn()
+                if h.unit.is_mobile:
+                    movable += 1
+        player = self.get_player(player_id)
+        if player:
+            player.movable_units = movable
 
     def check_victory(self) -> int | None:
         """Check if game is over. Returns winner player_id or None."""
@@ -8,6 +8,7 @@ from .player import Player
 from .units import Unit, UnitType
 from .rules import GameRules
 from .mapgen import generate_map, MapGenConfig
+from .history.action import GameAction, ActionType
 
 
 @dataclass
@@ -29,7 +30,7 @@ class GameState:
             player.update_regions(self.board)
             # Starting gold: 5g per non-tree hex in territory
             for region in player.regions:
-                non_tree_hexes = sum(1 for h in region.hexes if h.terrain != Terrain.TREE)
+                non_tree_hexes = sum(1 for h in region.hexes if h.terrain is not Terrain.TREE)
                 region.gold = 5 * non_tree_hexes
 
     @property
@@ -134,12 +135,12 @@ class GameState:
             if cap:
                 capital_hexes.add((cap.q, cap.r))
                 # Clear tree/grave from capital so player can always buy there
-                if cap.terrain in (Terrain.TREE, Terrain.GRAVE):
+                if cap.terrain is Terrain.TREE or cap.terrain is Terrain.GRAVE:
                     cap.terrain = Terrain.LAND
 
         # First: all graves become trees (except capitals)
         for h in territory:
-            if h.terrain == Terrain.GRAVE and (h.q, h.r) not in capital_hexes:
+            if h.terrain is Terrain.GRAVE and (h.q, h.r) not in capital_hexes:
                 h.terrain = Terrain.TREE
                 new_trees.append(h)
 
@@ -148,10 +149,16 @@ class GameState:
         # Palm trees (coastal): need 1+ tree neighbor on coast
         candidates = []
         for h in territory:
-            if h.terrain == Terrain.LAND and h.unit is None and (h.q, h.r) not in capital_hexes:
-                neighbors = self.board.neighbors(h)
-                tree_neighbors = sum(1 for n in neighbors if n.terrain == Terrain.TREE)
-                is_coastal = any(n.terrain == Terrain.SEA for n in neighbors)
+            if h.terrain is Terrain.LAND and h.unit is None and (h.q, h.r) not in capital_hexes:
+                # One pass over the neighbors counts trees and spots the coast
+                tree_neighbors = 0
+                is_coastal = False
+                for n in self.board.neighbors(h):
+                    terrain = n.terrain
+                    if terrain is Terrain.TREE:
+                        tree_neighbors += 1
+                    elif terrain is Terrain.SEA:
+                        is_coastal = True
 
                 # Coastal hexes: palm trees spread with just 1 tree neighbor
                 # Interior hexes: pine trees need 2+ tree neighbors
@@ -257,10 +264,35 @@ class GameState:
         self.actions_this_turn.append(action)
         return action
 
+    def apply_action(self, action: GameAction) -> dict:
+        """Re-apply a recorded action (used to replay history between snapshots).
+
+        Accepts both the human request params (from_q/q/...) and the result
+        dicts recorded for AI players (from/to/position).
+        """
+        params = action.params
+        action_type = action.action_type
+        if action_type is ActionType.TURN_START:
+            return self.start_turn()
+        if action_type is ActionType.END_TURN:
+            return self.end_turn()
+        if action_type is ActionType.MOVE:
+            if "from" in params:
+                (from_q, from_r), (to_q, to_r) = params["from"], params["to"]
+            else:
+                from_q, from_r = params["from_q"], params["from_r"]
+                to_q, to_r = params["to_q"], params["to_r"]
+            return self.move_unit(from_q, from_r, to_q, to_r)
+        if action_type is ActionType.BUY:
+            if "position" in params:
+                q, r = params["position"]
+            else:
+                q, r = params["q"], params["r"]
+            return self.buy_unit(params["unit_type"], q, r)
+        raise ValueError(f"Cannot replay action: {action_type}")
+
     def to_dict(self) -> dict:
         """Serialize game state to JSON-compatible dict."""
-        board_dict = self.board.to_dict()
-
         # Add capital info to hexes based on regions
         capital_hexes = set()
         for player in self.players:
@@ -269,9 +301,7 @@ class GameState:
                 if capital:
                     capital_hexes.add((capital.q, capital.r))
 
-        for key, hex_data in board_dict["hexes"].items():
-            q, r = map(int, key.split(","))
-            hex_data["has_capital"] = (q, r) in capital_hexes
+        board_dict = self.board.to_dict(capitals=capital_hexes)
 
         return {
             "turn": self.turn,
@@ -375,9 +405,10 @@ class GameState:
     @classmethod
     def from_snapshot(cls, snapshot) -> GameState:
         """Reconstruct GameState from a snapshot."""
-        from .history.snapshot import StateSnapshot
-
-        board = Board.from_dict(snapshot.board_data)
+        if isinstance(snapshot.board_data, dict):
+            board = Board.from_dict(snapshot.board_data)
+        else:
+            board = Board.from_records(snapshot.board_data)
         players = [Player.from_dict(pd, board) for pd in snapshot.players_data]
 
         # Create without calling __post_init__ (which resets gold)
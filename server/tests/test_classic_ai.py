@@ -0,0 +1,97 @@
+"""ClassicAI must choose exactly what a full rescan after every action would."""
+import asyncio
+import pickle
+import random
+import unittest
+
+from game.ai.classic import ClassicAI
+from game.config import GameConfig
+from game.orchestrator import GameOrchestrator
+from game.units import Unit, UnitType
+
+
+class FullRescanAI(ClassicAI):
+    """Reference: rescore everything from scratch before each action."""
+
+    def _execute_attacks(self, state):
+        return self._rescan_moves(state, attack=True, max_actions=50)
+
+    def _execute_repositioning(self, state):
+        return self._rescan_moves(state, attack=False, max_actions=30)
+
+    def _rescan_moves(self, state, attack, max_actions):
+        actions = []
+        for _ in range(max_actions):
+            self._clear_caches()
+            moves = [m for m in self._score_moves(state)
+                     if (m.to_hex.owner != self.player_id) == attack and m.score > 0]
+            if not moves:
+                break
+            move = self._pick_best(moves)
+            result = state.move_unit(move.from_hex.q, move.from_hex.r,
+                                     move.to_hex.q, move.to_hex.r)
+            if not result["success"]:
+                break
+            actions.append(result)
+        return actions
+
+    def _execute_purchases(self, state):
+        actions = []
+        for _ in range(20):
+            self._clear_caches()
+            purchase = self._pick_best(self._score_purchases(state))
+            if not purchase or purchase.score <= 0:
+                break
+            result = state.buy_unit(purchase.unit_type.value,
+                                    purchase.target_hex.q, purchase.target_hex.r)
+            if not result["success"]:
+                break
+            actions.append(result)
+        return actions
+
+
+def game_states(seed: int, difficulty: str, turns: int) -> list[bytes]:
+    """Pickled game states at the start of successive turns of an AI game."""
+    random.seed(seed)
+    config = GameConfig.all_classic_ai(4, difficulty)
+    config.map.seed = seed
+    orchestrator = GameOrchestrator(config)
+    orchestrator.initialize()
+    # Castles and spare gold so territories survive and the AI has choices
+    for player in orchestrator.game_state.players:
+        for region in player.regions:
+            min(region.hexes, key=lambda h: (h.q, h.r)).unit = Unit(UnitType.CASTLE, player.id)
+            region.gold += 40
+
+    states = []
+
+    async def play():
+        for _ in range(turns * 4):
+            states.append(pickle.dumps(orchestrator.game_state))
+            result = await orchestrator.run_current_turn()
+            if result["status"] == "victory":
+                break
+
+    asyncio.run(play())
+    return states
+
+
+class ClassicAIDifferentialTest(unittest.TestCase):
+    def play(self, cls, blob: bytes, difficulty: str):
+        state = pickle.loads(blob)
+        random.seed(0)
+        state.start_turn()
+        actions = cls(state.current_player.id, difficulty).play_turn(state)
+        return actions, state.board.to_records()
+
+    def test_matches_full_rescan(self):
+        for difficulty in ("hard", "normal"):
+            for seed in (1, 2, 3):
+                for i, blob in enumerate(game_states(seed, difficulty, turns=8)):
+                    with self.subTest(difficulty=difficulty, seed=seed, turn_index=i):
+                        self.assertEqual(self.play(ClassicAI, blob, difficulty),
+                                         self.play(FullRescanAI, blob, difficulty))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,46 @@
+"""Region figures follow in-place hex changes without manual invalidation."""
+import unittest
+
+from game.board import Board, Terrain
+from game.player import Player
+from game.units import Unit, UnitType
+
+
+class RegionTallyTest(unittest.TestCase):
+    def setUp(self):
+        self.board = Board(4, 4)
+        self.hexes = [self.board.get(q, 0) for q in range(4)]
+        for h in self.hexes:
+            h.owner = 0
+        self.player = Player(id=0)
+        self.player.update_regions(self.board)
+        self.region = self.player.regions[0]
+
+    def test_unit_changes(self):
+        self.assertEqual((self.region.get_upkeep(), self.region.tally()[1]), (0, 0))
+        self.hexes[1].unit = Unit(UnitType.SPEARMAN, 0)
+        self.assertEqual((self.region.get_upkeep(), self.region.tally()[1]), (6, 1))
+        self.hexes[2].unit = Unit(UnitType.CASTLE, 0)
+        self.assertTrue(self.region.has_castle())
+        self.assertEqual(self.player.get_total_units(), 2)
+        self.hexes[1].unit = None
+        self.assertEqual((self.region.get_upkeep(), self.region.tally()[1]), (0, 1))
+
+    def test_terrain_changes(self):
+        self.assertEqual(self.region.income, 4)
+        self.hexes[0].terrain = Terrain.TREE
+        self.hexes[3].terrain = Terrain.GRAVE
+        self.assertEqual(self.region.income, 2)
+        self.assertEqual((self.player.get_total_trees(), self.player.get_total_graves()), (1, 1))
+        self.hexes[0].terrain = Terrain.LAND
+        self.assertEqual(self.region.income, 3)
+
+    def test_starvation(self):
+        self.hexes[1].unit = Unit(UnitType.KNIGHT, 0)
+        self.region.gold = 3
+        self.assertEqual(self.region.pay_upkeep(), [self.hexes[1]])
+        self.assertEqual((self.region.get_upkeep(), self.region.income), (0, 3))
+
+
+if __name__ == "__main__":
+    unittest.main()
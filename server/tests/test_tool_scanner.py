@@ -0,0 +1,71 @@
+"""ToolCallScanner: tool calls out of streamed agent text."""
+import unittest
+
+from ai.agent import ToolCallScanner
+
+
+def scan(*blocks: str) -> list[tuple[str, str]]:
+    """Feed blocks in order, then flush; adjacent text segments are merged."""
+    scanner = ToolCallScanner()
+    segments = []
+    for block in blocks:
+        segments.extend(scanner.feed(block))
+    segments.extend(scanner.flush())
+    merged = []
+    for kind, segment in segments:
+        if merged and kind == "text" and merged[-1][0] == "text":
+            merged[-1] = ("text", merged[-1][1] + segment)
+        else:
+            merged.append((kind, segment))
+    return merged
+
+
+def tools(segments: list[tuple[str, str]]) -> list[str]:
+    return [segment for kind, segment in segments if kind == "tool"]
+
+
+class ToolCallScannerTest(unittest.TestCase):
+    def test_single_line(self):
+        self.assertEqual(scan('Buy one.\n{"tool": "buy", "q": 1, "r": 2}\nDone.'), [
+            ("text", "Buy one.\n"),
+            ("tool", '{"tool": "buy", "q": 1, "r": 2}'),
+            ("text", "\nDone."),
+        ])
+
+    def test_multi_line(self):
+        call = '{\n  "tool": "move",\n  "from_q": 0, "from_r": 6,\n  "to_q": 0, "to_r": 5\n}'
+        self.assertEqual(tools(scan(f"Moving:\n{call}\n")), [call])
+
+    def test_nested(self):
+        call = '{"tool": "move", "args": {"from": [0, 6], "to": [0, 5]}}'
+        self.assertEqual(tools(scan(f"x {call} y")), [call])
+
+    def test_brace_in_string(self):
+        call = '{"tool": "end_turn", "note": "a } and a { in text"}'
+        self.assertEqual(tools(scan(call)), [call])
+
+    def test_split_across_feeds(self):
+        segments = scan('Plan {"tool": "buy", "unit_', 'type": "peasant",\n', ' "q": 1, "r": 2} ok')
+        self.assertEqual(segments, [
+            ("text", "Plan "),
+            ("tool", '{"tool": "buy", "unit_type": "peasant",\n "q": 1, "r": 2}'),
+            ("text", " ok"),
+        ])
+
+    def test_stray_prose_brace(self):
+        self.assertEqual(tools(scan('I\'ll go {left first {"tool":"end_turn"}')),
+                         ['{"tool":"end_turn"}'])
+        self.assertEqual(tools(scan("a set like {a, b ...\n",
+                                    '{"tool":"buy","unit_type":"peasant","q":1,"r":2}\n',
+                                    '{"tool":"end_turn"}')),
+                         ['{"tool":"buy","unit_type":"peasant","q":1,"r":2}', '{"tool":"end_turn"}'])
+
+    def test_non_tool_json_is_reasoning(self):
+        self.assertEqual(scan('{"plan": "attack"} then'), [("text", '{"plan": "attack"} then')])
+
+    def test_unterminated_object_at_end_is_reasoning(self):
+        self.assertEqual(scan('thinking {"tool": "mo'), [("text", 'thinking {"tool": "mo')])
+
+
+if __name__ == "__main__":
+    unittest.main()
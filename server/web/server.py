@@ -2,6 +2,7 @@
 
 import asyncio
 import json
+from contextlib import asynccontextmanager
 from pathlib import Path
 from typing import Optional
 
@@ -17,7 +18,7 @@ from game.state import GameState
 from game.config import GameConfig, PlayerConfig, MapConfig
 from game.orchestrator import GameOrchestrator
 from game.controllers import HumanController
-from game.database import save_game, load_last_game, new_game_slot, list_games, load_game_by_id
+from game.database import save_game_async, schedule_save, flush_saves, load_last_game, new_game_slot, list_games, load_game_by_id
 
 
 class ConnectionManager:
@@ -65,8 +66,15 @@ class GameConfigRequest(BaseModel):
     enable_history: bool = True
 
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    # Auto-saves are debounced; write the last ones before the server stops
+    await flush_saves()
+
+
 def create_app() -> FastAPI:
-    app = FastAPI(title="Slay AI")
+    app = FastAPI(title="Slay AI", lifespan=lifespan)
     manager = ConnectionManager()
 
     # Game state
@@ -186,7 +194,7 @@ def create_app() -> FastAPI:
         game_state = orchestrator.initialize()
 
         # Save immediately to get game_id
-        current_game_id = save_game(orchestrator, None)
+        current_game_id = await save_game_async(orchestrator, None)
 
         await manager.broadcast({
             "type": "new_game",
@@ -248,7 +256,7 @@ def create_app() -> FastAPI:
         game_state = orchestrator.initialize()
 
         # Save as new game
-        current_game_id = save_game(orchestrator, None)
+        current_game_id = await save_game_async(orchestrator, None)
 
         await manager.broadcast({
             "type": "new_game",
@@ -334,7 +342,7 @@ def create_app() -> FastAPI:
         nonlocal current_game_id
         if not orchestrator:
             return {"status": "error", "message": "No game to save"}
-        current_game_id = save_game(orchestrator, current_game_id)
+        current_game_id = await save_game_async(orchestrator, current_game_id)
         return {"status": "ok", "game_id": current_game_id}
 
     # ==================== Game Control ====================
@@ -476,7 +484,7 @@ def create_app() -> FastAPI:
         })
 
         # Auto-save after each action
-        save_game(orchestrator, current_game_id)
+        schedule_save(orchestrator, current_game_id)
 
         return result
 
@@ -531,12 +539,14 @@ def create_app() -> FastAPI:
         if not orchestrator.history:
             return {"status": "error", "message": "History not enabled"}
 
-        snapshot = orchestrator.history.get_snapshot(snapshot_id)
-        if not snapshot:
+        if not orchestrator.history.get_snapshot(snapshot_id):
             return {"status": "error", "message": f"Snapshot {snapshot_id} not found"}
 
-        # Restore to GameState and serialize for client compatibility
-        temp_state = snapshot.restore()
+        # Restore to GameState (replaying from the nearest full snapshot) and serialize
+        try:
+            temp_state = orchestrator.history.get_state_at_snapshot(snapshot_id)
+        except ValueError as e:
+            return {"status": "error", "message": str(e)}
         return {
             "status": "ok",
             "snapshot_id": snapshot_id,
@@ -554,8 +564,7 @@ def create_app() -> FastAPI:
 
         # From snapshots
         if orchestrator.history:
-            for turn in sorted(orchestrator.history.snapshots.keys()):
-                snapshot = orchestrator.history.snapshots[turn]
+            for turn, snapshot in enumerate(orchestrator.history.snapshots, start=1):
                 history.append({
                     "turn": turn,
                     "players": [
@@ -697,7 +706,7 @@ def create_app() -> FastAPI:
             await manager.broadcast(build_state_message())
 
             # Auto-save after each turn
-            save_game(orchestrator, current_game_id)
+            schedule_save(orchestrator, current_game_id)
 
             # If now waiting for human, don't delay
             if orchestrator.waiting_for_human: